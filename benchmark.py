@@ -0,0 +1,292 @@
+"""
+Benchmarks dos caminhos críticos da fazenda com mundos sintéticos.
+
+Gera fazendas de até 1 milhão de tiles e mede atualizar_terra_aguada,
+atualizar_plantas, atualizar_trabalhadores, UI.desenhar_cenario (numa Surface
+fora da tela), SaveSystem.save_game (completo e com o diário), SaveSystem.load_game,
+uma semana de progresso offline sobre o save carregado e main.carregar_jogo (o
+carregamento completo, incluindo a reconstrução da terra aguada e das tarefas).
+Também compara as plantas (Planta) com os dicts equivalentes: memória ocupada e
+tempo de leitura dos campos usados em atualizar_plantas.
+
+Uso:
+    python benchmark.py --tamanhos 1000 10000 100000 --saida resultados.json
+    python benchmark.py --baseline resultados.json --tolerancia 0.25
+"""
+import os
+
+# Precisa vir antes de qualquer import do pygame (config chama pygame.init())
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+import pygame
+from config import LARGURA, ALTURA, TAMANHO_CELULA, TIPOS_SEMENTE, carregar_sprites
+from save_system import SaveSystem
+from offline_progress import aplicar_progresso_offline
+from plant import Planta, TipoSemente
+from ui import UI
+from camera import Camera
+from sim import criar_mundo
+from main import carregar_jogo
+
+TAMANHOS_PADRAO = [1000, 10000, 100000]
+TAMANHO_MAXIMO = 1000000
+SEGUNDOS_OFFLINE = 7 * 24 * 3600
+
+
+def gerar_mundo(tiles, espacamento_buracos=7, fracao_plantas=0.5, trabalhadores=30, pocos=4, seed=0):
+    """
+    Cria uma fazenda quadrada com aproximadamente `tiles` tiles: buracos com água
+    em grade intercalada, terra adubada em todo o terreno aguado e plantas em
+    `fracao_plantas` dele, em estágios variados.
+    """
+    aleatorio = random.Random(seed)
+    relogio, player, farm_system, water_system, worker_system = criar_mundo()
+    lado = max(1, int(math.sqrt(tiles)))
+    
+    buracos = []
+    for linha, y in enumerate(range(0, lado, espacamento_buracos)):
+        deslocamento = (espacamento_buracos // 2) if linha % 2 else 0
+        for x in range(deslocamento, lado, espacamento_buracos):
+            buracos.append([x, y])
+    lista_pocos = [[-10 * (i + 1), -10] for i in range(pocos)]
+    water_system.carregar_dados(buracos, [], lista_pocos)
+    
+    tipos = list(TipoSemente)
+    agora = relogio.agora()
+    fazenda = {}
+    terra_adubada = []
+    for posicao in water_system.terra_aguada:
+        if not (0 <= posicao[0] < lado and 0 <= posicao[1] < lado):
+            continue
+        terra_adubada.append(posicao)
+        if aleatorio.random() < fracao_plantas:
+            tipo = aleatorio.choice(tipos)
+            fator = aleatorio.uniform(0.7, 1.3)
+            tempo_crescimento = TIPOS_SEMENTE[tipo]['tempo_crescimento'] * fator
+            fazenda[posicao] = Planta(tipo, 1, agora - aleatorio.uniform(0, tempo_crescimento * 10), False, fator)
+    farm_system.carregar_dados(fazenda, terra_adubada)
+    
+    tipos_trabalhador = list(worker_system.tipos_trabalhador.keys())
+    worker_system.carregar_dados([{
+        'tipo': tipos_trabalhador[i % len(tipos_trabalhador)],
+        'x': aleatorio.randrange(lado) * TAMANHO_CELULA,
+        'y': aleatorio.randrange(lado) * TAMANHO_CELULA,
+        'ativo': True,
+        'ultimo_pagamento': agora
+    } for i in range(trabalhadores)])
+    
+    player.dinheiro = 10 ** 9
+    player.sementes = {tipo: 10 ** 9 for tipo in tipos}
+    player.x = player.y = lado * TAMANHO_CELULA // 2
+    
+    # Processa a avaliação inicial de todas as plantas fora das medições
+    farm_system.atualizar_plantas(water_system)
+    return relogio, player, farm_system, water_system, worker_system
+
+
+def medir(funcao, repeticoes, preparar=None):
+    """Executa funcao `repeticoes` vezes e retorna a mediana e o mínimo em segundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {'mediana': statistics.median(tempos), 'minimo': min(tempos)}
+
+
+def medir_planta_vs_dict(plantas, repeticoes):
+    """Compara as plantas com dicts de mesmo conteúdo: bytes ocupados e leitura dos campos"""
+    dicts = [{'tipo': planta.tipo, 'estagio': planta.estagio, 'tempo_plantio': planta.tempo_plantio,
+              'estragada': planta.estragada, 'fator_crescimento': planta.fator_crescimento}
+             for planta in plantas]
+    
+    def ler_plantas():
+        for planta in plantas:
+            if not planta.estragada and planta.estagio < 4:
+                planta.tempo_plantio * planta.fator_crescimento, planta.tipo
+    
+    def ler_dicts():
+        for planta in dicts:
+            if not planta['estragada'] and planta['estagio'] < 4:
+                planta['tempo_plantio'] * planta['fator_crescimento'], planta['tipo']
+    
+    # Os valores dos campos são os mesmos objetos nos dois casos; só o registro muda
+    return {
+        'memoria_plantas_bytes': sum(sys.getsizeof(planta) for planta in plantas),
+        'memoria_plantas_dict_bytes': sum(sys.getsizeof(planta) for planta in dicts),
+        'acesso_plantas': medir(ler_plantas, repeticoes),
+        'acesso_plantas_dict': medir(ler_dicts, repeticoes)
+    }
+
+
+def executar_benchmarks(tiles, repeticoes, sprites, opcoes):
+    relogio, player, farm_system, water_system, worker_system = gerar_mundo(tiles, **opcoes)
+    resultados = {}
+    
+    resultados['atualizar_terra_aguada'] = medir(water_system.atualizar_terra_aguada, repeticoes)
+    
+    def tick():
+        relogio.avancar(relogio.passo)
+    
+    resultados['atualizar_plantas'] = medir(
+        lambda: farm_system.atualizar_plantas(water_system), repeticoes, tick)
+    resultados['atualizar_trabalhadores'] = medir(
+        lambda: worker_system.atualizar_trabalhadores(farm_system, water_system, player), repeticoes, tick)
+    
+    tela = pygame.Surface((LARGURA, ALTURA))
+    ui = UI(relogio)
+    camera = Camera(player)
+    camera.atualizar(LARGURA, ALTURA)
+    resultados['desenhar_cenario'] = medir(
+        lambda: ui.desenhar_cenario(tela, sprites, water_system, farm_system, LARGURA, ALTURA, camera), repeticoes)
+    
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'benchmark_save.sav')
+        resultados['save_game'] = medir(
+            lambda: SaveSystem.save_game(player, farm_system, water_system, worker_system, caminho, completo=True),
+            repeticoes)
+        resultados['load_game'] = medir(lambda: SaveSystem.load_game(relogio, caminho), repeticoes)
+        resultados['tamanho_save_bytes'] = os.path.getsize(caminho)
+        
+        # Save com o diário: poucos tiles alterados desde o save anterior
+        alterados = list(itertools.islice(farm_system.terra_adubada, 100))
+        
+        def alterar_tiles():
+            for posicao in alterados:
+                farm_system.terra_adubada.discard(posicao)
+                farm_system.terra_adubada.add(posicao)
+        resultados['save_game_diario'] = medir(
+            lambda: SaveSystem.save_game(player, farm_system, water_system, worker_system, caminho),
+            repeticoes, alterar_tiles)
+        
+        # Uma semana de progresso offline sobre o save carregado
+        dados = {}
+        
+        def carregar_save():
+            dados['save'] = SaveSystem.load_game(relogio, caminho)
+        resultados['progresso_offline'] = medir(
+            lambda: aplicar_progresso_offline(dados['save'], SEGUNDOS_OFFLINE, relogio.agora()),
+            repeticoes, carregar_save)
+        
+        # Caminho completo de carregamento: ler o save e reconstruir os sistemas (terra aguada e tarefas)
+        sistemas = {}
+        
+        def novos_sistemas():
+            sistemas['mundo'] = criar_mundo()
+        
+        def carregar_sistemas():
+            novo_relogio, novo_player, nova_farm, nova_water, novos_workers = sistemas['mundo']
+            carregar_jogo(novo_player, nova_farm, nova_water, novos_workers, novo_relogio, caminho, 0)
+        resultados['carregar_jogo'] = medir(carregar_sistemas, repeticoes, novos_sistemas)
+    
+    resultados.update(medir_planta_vs_dict(list(farm_system.fazenda.values()), repeticoes))
+    
+    resultados['contagens'] = {
+        'plantas': len(farm_system.fazenda),
+        'terra_aguada': len(water_system.terra_aguada),
+        'buracos_com_agua': len(water_system.buracos_com_agua),
+        'trabalhadores': len(worker_system.trabalhadores)
+    }
+    return resultados
+
+
+def comparar_com_baseline(resultados, baseline, tolerancia):
+    """Retorna as métricas cuja mediana piorou mais que a tolerância em relação ao baseline"""
+    regressoes = []
+    for tamanho, metricas in resultados.items():
+        metricas_base = baseline.get(tamanho, {})
+        for nome, valor in metricas.items():
+            base = metricas_base.get(nome)
+            if not isinstance(valor, dict) or not isinstance(base, dict) or 'mediana' not in valor:
+                continue
+            if base['mediana'] > 0 and valor['mediana'] > base['mediana'] * (1 + tolerancia):
+                regressoes.append((tamanho, nome, base['mediana'], valor['mediana']))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Mundo da Roça com fazendas sintéticas")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help=f"Quantidades aproximadas de tiles dos mundos gerados (1 a {TAMANHO_MAXIMO})")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Execuções por medição")
+    parser.add_argument('--trabalhadores', type=int, default=30)
+    parser.add_argument('--espacamento-buracos', type=int, default=7)
+    parser.add_argument('--fracao-plantas', type=float, default=0.5)
+    parser.add_argument('--pocos', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', default='benchmark_resultados.json', help="Arquivo JSON com os resultados")
+    parser.add_argument('--baseline', help="Resultados anteriores para comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Piora relativa aceita antes de acusar regressão (0.25 = 25%%)")
+    args = parser.parse_args()
+    
+    invalidos = [tiles for tiles in args.tamanhos if not 1 <= tiles <= TAMANHO_MAXIMO]
+    if invalidos:
+        parser.error(f"--tamanhos fora do intervalo de 1 a {TAMANHO_MAXIMO}: {invalidos}")
+    
+    # Lido antes de gravar os resultados: --saida pode ser o mesmo arquivo do baseline
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('resultados', {})
+    
+    pygame.display.set_mode((1, 1))
+    sprites = carregar_sprites()
+    opcoes = {
+        'espacamento_buracos': args.espacamento_buracos,
+        'fracao_plantas': args.fracao_plantas,
+        'trabalhadores': args.trabalhadores,
+        'pocos': args.pocos,
+        'seed': args.seed
+    }
+    
+    resultados = {}
+    for tiles in args.tamanhos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados[str(tiles)] = executar_benchmarks(tiles, args.repeticoes, sprites, opcoes)
+        print(f"{tiles} tiles:")
+        for nome, valor in resultados[str(tiles)].items():
+            if isinstance(valor, dict) and 'mediana' in valor:
+                print(f"  {nome:<26} {valor['mediana'] * 1000:10.3f} ms")
+            elif nome.endswith('_bytes'):
+                print(f"  {nome:<26} {valor:10d} B")
+    
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            'data': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'opcoes': opcoes,
+            'repeticoes': args.repeticoes,
+            'resultados': resultados
+        }, f, indent=4, ensure_ascii=False)
+    print(f"Resultados salvos em {args.saida}")
+    
+    if baseline is not None:
+        regressoes = comparar_com_baseline(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print("REGRESSÕES DE DESEMPENHO:")
+            for tamanho, nome, antes, depois in regressoes:
+                print(f"  {tamanho} tiles - {nome}: {antes * 1000:.3f} ms -> {depois * 1000:.3f} ms")
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,15 @@ pygame.init()
 
 LARGURA, ALTURA = 1256, 768
 TAMANHO_CELULA = 40
+TAMANHO_CHUNK = 16  # Lado (em tiles) dos chunks do armazenamento espacial do mundo
 FPS = 60
+ESCALAS_TEMPO = (1, 2, 10, 100)  # Velocidades da simulação alternadas com a tecla T
+ATUALIZACAO_PARCIAL_TELA = True  # Envia ao display só as regiões alteradas em cada quadro
+PROGRESSO_OFFLINE = False  # Ao carregar, avança plantas, colheitas e salários pelo tempo com o jogo fechado
+
+# Agendamento dos trabalhadores: 'individual' (cada um busca sua tarefa) ou
+# 'lote' (todos os ociosos de um tipo são casados com tarefas de uma vez por tick)
+MODO_AGENDAMENTO_TRABALHADORES = 'lote'
 
 # Posição do poço no mundo (coordenadas de grid)
 # Jogador inicia próximo ao poço
@@ -35,24 +43,46 @@ CORES = {
 }
 
 def carregar_sprites():
-    sprites = {
-        'char': pygame.transform.scale(pygame.image.load("assets/char.png"), (40, 75)),
-        'grama': pygame.image.load("assets/grama.png"),
-        'terra': pygame.transform.scale(pygame.image.load("assets/terra.png"), (TAMANHO_CELULA, TAMANHO_CELULA)),
-        'terra_aguada': pygame.transform.scale(pygame.image.load("assets/terra_aguada.png"), (TAMANHO_CELULA, TAMANHO_CELULA)),
-        'poco': pygame.transform.scale(pygame.image.load("assets/poco.png"), (TAMANHO_CELULA * 2, TAMANHO_CELULA * 2)),
-        'buraco': pygame.transform.scale(pygame.image.load("assets/buraco.png"), (TAMANHO_CELULA, TAMANHO_CELULA)),
-        'agua': pygame.transform.scale(pygame.image.load("assets/agua.png"), (TAMANHO_CELULA, TAMANHO_CELULA)),
-        'trabalhador': pygame.transform.scale(pygame.image.load("assets/char.png"), (30, 50))
-    }
+    """
+    Carrega cada imagem uma única vez, redimensiona e empacota tudo num SpriteAtlas
+    no formato do display. As chaves antigas do dicionário continuam disponíveis
+    (como subsurfaces do atlas); as plantas também podem ser obtidas por
+    sprites['atlas'][(tipo, estagio)].
+    """
+    from sprite_atlas import SpriteAtlas
+    
+    imagens = {}
+    
+    def carregar(caminho, tamanho=None):
+        if caminho not in imagens:
+            imagens[caminho] = pygame.image.load(caminho)
+        imagem = imagens[caminho]
+        return pygame.transform.scale(imagem, tamanho) if tamanho is not None else imagem
+    
+    atlas = SpriteAtlas()
+    atlas.adicionar('char', carregar("assets/char.png", (40, 75)))
+    atlas.adicionar('grama', carregar("assets/grama.png"))
+    atlas.adicionar('terra', carregar("assets/terra.png", (TAMANHO_CELULA, TAMANHO_CELULA)))
+    atlas.adicionar('terra_aguada', carregar("assets/terra_aguada.png", (TAMANHO_CELULA, TAMANHO_CELULA)))
+    atlas.adicionar('poco', carregar("assets/poco.png", (TAMANHO_CELULA * 2, TAMANHO_CELULA * 2)))
+    atlas.adicionar('buraco', carregar("assets/buraco.png", (TAMANHO_CELULA, TAMANHO_CELULA)))
+    atlas.adicionar('agua', carregar("assets/agua.png", (TAMANHO_CELULA, TAMANHO_CELULA)))
+    atlas.adicionar('trabalhador', carregar("assets/char.png", (30, 50)))
+    
+    for tipo in TIPOS_SEMENTE:
+        for estagio in range(1, 8):
+            caminho = f"assets/{tipo}/{tipo}_{estagio}.png"
+            atlas.adicionar((tipo, estagio), carregar(caminho, (TAMANHO_CELULA, TAMANHO_CELULA)))
+    atlas.construir()
+    
+    sprites = {chave: atlas[chave] for chave in
+               ['char', 'grama', 'terra', 'terra_aguada', 'poco', 'buraco', 'agua', 'trabalhador']}
+    sprites['atlas'] = atlas
     
     sprites['plantas'] = {}
-    for tipo in ['milho', 'tomate', 'alface']:
+    for tipo in TIPOS_SEMENTE:
         sprites['plantas'][tipo] = {}
         for estagio in range(1, 8):
-            caminho = f"assets/{tipo}/{tipo}_{estagio}.png"
-            img = pygame.image.load(caminho)
-            img = pygame.transform.scale(img, (TAMANHO_CELULA, TAMANHO_CELULA))
-            sprites['plantas'][tipo][estagio] = img
+            sprites['plantas'][tipo][estagio] = atlas[(tipo, estagio)]
     
     return sprites
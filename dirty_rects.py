@@ -0,0 +1,33 @@
+import pygame
+
+MAX_REGIOES = 64  # Acima disso sai mais barato enviar a tela inteira
+
+class DirtyRectTracker:
+    """
+    Acumula as regiões da tela que mudaram no quadro e envia ao display só elas.
+    Quando algo afeta a tela toda (câmera, redimensionamento, menus abrindo ou
+    fechando), marcar_tudo() faz o próximo envio ser completo.
+    """
+    
+    def __init__(self, ativo=True, max_regioes=MAX_REGIOES):
+        self.ativo = ativo
+        self.max_regioes = max_regioes
+        self.regioes = []
+        self.tudo = True  # O primeiro quadro sempre é enviado inteiro
+    
+    def marcar(self, rect):
+        self.regioes.append(pygame.Rect(rect))
+    
+    def marcar_tudo(self):
+        self.tudo = True
+    
+    def enviar(self, tela):
+        """Atualiza o display com as regiões marcadas e começa um novo quadro"""
+        if not self.ativo or self.tudo or len(self.regioes) > self.max_regioes:
+            pygame.display.update()
+        elif self.regioes:
+            area = tela.get_rect()
+            regioes = [rect.clip(area) for rect in self.regioes]
+            pygame.display.update([rect for rect in regioes if rect.width and rect.height])
+        self.regioes = []
+        self.tudo = False
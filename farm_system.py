@@ -1,11 +1,19 @@
-import time
+import heapq
 import random
+import itertools
 from config import TIPOS_SEMENTE, POCO_POS
+from world_store import WorldStore
+from plant import Planta, TipoSemente
+from sim_clock import SimClock
 
 class FarmSystem:
-    def __init__(self):
-        self.fazenda = {}
-        self.terra_adubada = set()
+    def __init__(self, mundo=None, relogio=None):
+        self.mundo = mundo if mundo is not None else WorldStore()
+        self.relogio = relogio if relogio is not None else SimClock()
+        self.fazenda = self.mundo.fazenda
+        self.terra_adubada = self.mundo.terra_adubada
+        self.agenda = []  # heap de (tempo, contador, posicao, planta) com a próxima transição de cada planta
+        self._contador_agenda = itertools.count()
     
     def adubar_terra(self, grid_x, grid_y, water_system, player):
         posicao = (grid_x, grid_y)
@@ -35,14 +43,12 @@ class FarmSystem:
             posicao != (POCO_POS[0], POCO_POS[1] + 1) and
             posicao != (POCO_POS[0] + 1, POCO_POS[1] + 1)):
             fator_crescimento = random.uniform(0.7, 1.3)
+            tempo_plantio = self.relogio.agora()
             
-            self.fazenda[posicao] = {
-                'tipo': tipo,
-                'estagio': 1,
-                'tempo_plantio': time.time(),
-                'estragada': False,
-                'fator_crescimento': fator_crescimento
-            }
+            planta = Planta(TipoSemente(tipo), 1, tempo_plantio, False, fator_crescimento)
+            self.fazenda[posicao] = planta
+            # Primeira verificação no próximo tick (inclui checar se a terra está aguada)
+            self._agendar(posicao, planta, tempo_plantio)
             sementes[tipo] -= 1
             return True
         return False
@@ -51,8 +57,8 @@ class FarmSystem:
         posicao = (grid_x, grid_y)
         if posicao in self.fazenda:
             planta = self.fazenda[posicao]
-            if planta['estagio'] == 6:
-                valor = TIPOS_SEMENTE[planta['tipo']]['valor_colheita']
+            if planta.estagio == 6:
+                valor = TIPOS_SEMENTE[planta.tipo]['valor_colheita']
                 del self.fazenda[posicao]
                 if posicao in self.terra_adubada:
                     self.terra_adubada.discard(posicao)
@@ -63,71 +69,154 @@ class FarmSystem:
         posicao = (grid_x, grid_y)
         if posicao in self.fazenda:
             planta = self.fazenda[posicao]
-            if planta['estagio'] == 7 or planta.get('estragada', False):
+            if planta.estagio == 7 or planta.estragada:
                 del self.fazenda[posicao]
                 if posicao in self.terra_adubada:
                     self.terra_adubada.discard(posicao)
                 return True
         return False
     
+    def _agendar(self, posicao, planta, tempo):
+        heapq.heappush(self.agenda, (tempo, next(self._contador_agenda), posicao, planta))
+    
+    @staticmethod
+    def _tempo_crescimento(planta):
+        return TIPOS_SEMENTE[planta.tipo]['tempo_crescimento'] * planta.fator_crescimento
+    
+    @staticmethod
+    def _calcular_estagio(tempo_decorrido, tempo_crescimento):
+        """Retorna (estagio, remover) de uma planta não seca após tempo_decorrido"""
+        estagio_calculado = int(tempo_decorrido / tempo_crescimento) + 1
+        
+        if estagio_calculado >= 6:
+            tempo_ate_estagio_6 = tempo_crescimento * 5
+            tempo_extra = tempo_decorrido - tempo_ate_estagio_6
+            
+            if tempo_extra < tempo_crescimento * 3:
+                novo_estagio = 6
+            else:
+                novo_estagio = 7
+        else:
+            novo_estagio = estagio_calculado
+        
+        remover = novo_estagio == 7 and tempo_decorrido >= tempo_crescimento * 15
+        return novo_estagio, remover
+    
+    @staticmethod
+    def estado_apos(planta, tempo_decorrido):
+        """Estágio de uma planta não seca após tempo_decorrido e se ela já teria sido removida"""
+        return FarmSystem._calcular_estagio(tempo_decorrido, FarmSystem._tempo_crescimento(planta))
+    
+    @staticmethod
+    def _proxima_transicao(planta, tempo_crescimento):
+        """Momento da próxima mudança: estágio N->N+1, madura->estragada ou estragada->removida"""
+        estagio = planta.estagio
+        if estagio < 6:
+            return planta.tempo_plantio + tempo_crescimento * estagio
+        elif estagio == 6:
+            return planta.tempo_plantio + tempo_crescimento * 8
+        return planta.tempo_plantio + tempo_crescimento * 15
+    
+    def _secar_planta(self, posicao, planta):
+        planta.estragada = True
+        planta.estagio = 7
+        self.mundo.atualizar_tarefas(posicao)
+    
     def atualizar_plantas(self, water_system):
-        tempo_atual = time.time()
-        plantas_para_remover = []
+        """Processa apenas as plantas que secaram ou cuja transição já venceu"""
+        for posicao in water_system.consumir_terra_secada():
+            if posicao in water_system.terra_aguada:
+                # Voltou a ser aguada antes desta atualização (ex: buraco refeito no mesmo quadro)
+                continue
+            planta = self.fazenda.get(posicao)
+            if planta is not None and not planta.estragada:
+                self._secar_planta(posicao, planta)
         
-        for posicao, planta in self.fazenda.items():
-            tempo_decorrido = tempo_atual - planta['tempo_plantio']
-            tipo = planta['tipo']
-            tempo_crescimento_base = TIPOS_SEMENTE[tipo]['tempo_crescimento']
+        agenda = self.agenda
+        if not agenda:
+            return
+        
+        tempo_atual = self.relogio.agora()
+        while agenda and agenda[0][0] <= tempo_atual:
+            _, _, posicao, planta = heapq.heappop(agenda)
             
-            fator_crescimento = planta.get('fator_crescimento', 1.0)
-            tempo_crescimento = tempo_crescimento_base * fator_crescimento
+            # Entrada obsoleta: planta colhida/removida/substituída ou já seca
+            if self.fazenda.get(posicao) is not planta or planta.estragada:
+                continue
             
-            if posicao not in water_system.terra_aguada and not planta.get('estragada', False):
-                planta['estragada'] = True
-                planta['estagio'] = 7
+            if posicao not in water_system.terra_aguada:
+                self._secar_planta(posicao, planta)
                 continue
             
-            if not planta.get('estragada', False):
-                estagio_calculado = int(tempo_decorrido / tempo_crescimento) + 1
-                
-                if estagio_calculado >= 6:
-                    tempo_ate_estagio_6 = tempo_crescimento * 5
-                    tempo_extra = tempo_decorrido - tempo_ate_estagio_6
-                    
-                    if tempo_extra < tempo_crescimento * 3:
-                        novo_estagio = 6
-                    else:
-                        novo_estagio = 7
-                else:
-                    novo_estagio = estagio_calculado
-                
-                planta['estagio'] = novo_estagio
-                
-                if novo_estagio == 7 and tempo_decorrido > tempo_crescimento * 15:
-                    plantas_para_remover.append(posicao)
-        
-        for posicao in plantas_para_remover:
-            del self.fazenda[posicao]
+            tempo_crescimento = self._tempo_crescimento(planta)
+            tempo_decorrido = tempo_atual - planta.tempo_plantio
+            novo_estagio, remover = self._calcular_estagio(tempo_decorrido, tempo_crescimento)
+            
+            if remover:
+                del self.fazenda[posicao]
+                continue
+            
+            if novo_estagio != planta.estagio:
+                planta.estagio = novo_estagio
+                # O estágio é recalculado pelo tempo ao carregar, então o diário de saves não precisa dele
+                self.mundo.atualizar_tarefas(posicao, registrar=False)
+            # Garante progresso mesmo com arredondamento de ponto flutuante na fronteira do estágio
+            proxima = max(self._proxima_transicao(planta, tempo_crescimento), tempo_atual + 0.001)
+            self._agendar(posicao, planta, proxima)
     
     def carregar_dados(self, fazenda, terra_adubada):
-        self.fazenda = fazenda
-        self.terra_adubada = set(tuple(pos) for pos in terra_adubada)
+        self.mundo.recarregar_camada(self.fazenda, fazenda)
+        self.mundo.recarregar_camada(self.terra_adubada, (tuple(pos) for pos in terra_adubada))
+        
+        # Reagendar todas as plantas para serem reavaliadas no próximo tick
+        tempo_atual = self.relogio.agora()
+        self.agenda = []
+        for posicao, planta in self.fazenda.items():
+            if not planta.estragada:
+                self.agenda.append((tempo_atual, next(self._contador_agenda), posicao, planta))
+        heapq.heapify(self.agenda)
     
-    def obter_dados_save(self):
-        tempo_atual = time.time()
+    def obter_snapshot(self, posicoes=None):
+        """
+        Cópia barata do estado em tuplas; a formatação para o save pode ser feita em outra thread.
+        Com posicoes, inclui só esses tiles (entrada do diário de saves).
+        """
+        if posicoes is None:
+            plantas = self.fazenda.items()
+            terra_adubada = list(self.terra_adubada)
+        else:
+            plantas = []
+            for posicao in posicoes:
+                planta = self.fazenda.get(posicao)
+                if planta is not None:
+                    plantas.append((posicao, planta))
+            terra_adubada = [posicao for posicao in posicoes if posicao in self.terra_adubada]
+        return {
+            'tempo': self.relogio.agora(),
+            'plantas': [(posicao, planta.tipo, planta.estagio, planta.tempo_plantio,
+                         planta.estragada, planta.fator_crescimento)
+                        for posicao, planta in plantas],
+            'terra_adubada': terra_adubada
+        }
+    
+    @staticmethod
+    def formatar_dados_save(snapshot):
+        tempo_atual = snapshot['tempo']
         fazenda_serializada = {}
-        for posicao, planta in self.fazenda.items():
+        for posicao, tipo, estagio, tempo_plantio, estragada, fator_crescimento in snapshot['plantas']:
             key = f"{posicao[0]},{posicao[1]}"
-            tempo_decorrido = tempo_atual - planta['tempo_plantio']
             fazenda_serializada[key] = {
-                'tipo': planta['tipo'],
-                'estagio': planta['estagio'],
-                'tempo_decorrido': tempo_decorrido,
-                'estragada': planta.get('estragada', False),
-                'fator_crescimento': planta.get('fator_crescimento', 1.0)
+                'tipo': tipo,
+                'estagio': estagio,
+                'tempo_decorrido': tempo_atual - tempo_plantio,
+                'estragada': estragada,
+                'fator_crescimento': fator_crescimento
             }
         
         return {
             'fazenda': fazenda_serializada,
-            'terra_adubada': [list(pos) for pos in self.terra_adubada]
+            'terra_adubada': [list(pos) for pos in snapshot['terra_adubada']]
         }
+    
+    def obter_dados_save(self):
+        return self.formatar_dados_save(self.obter_snapshot())
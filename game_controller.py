@@ -64,8 +64,9 @@ class GameController:
             if colheu:
                 self.player.adicionar_dinheiro(valor)
             else:
-                self.farm_system.plantar_semente(grid_x, grid_y, self.player.semente_selecionada, 
-                                                 self.player.sementes, self.water_system)
+                if self.farm_system.plantar_semente(grid_x, grid_y, self.player.semente_selecionada, 
+                                                    self.player.sementes, self.water_system):
+                    self.player.marcar_alterado()
     
     def processar_movimento(self, teclas, largura, altura):
         direcoes = [
@@ -2,7 +2,7 @@ import pygame
 import sys
 from menu import mostrar_menu
 from save_system import SaveSystem
-from config import LARGURA, ALTURA, FPS, carregar_sprites
+from config import LARGURA, ALTURA, FPS, ESCALAS_TEMPO, PROGRESSO_OFFLINE, carregar_sprites
 from player import Player
 from farm_system import FarmSystem
 from water_system import WaterSystem
@@ -11,8 +11,11 @@ from shop import Shop
 from ui import UI
 from game_controller import GameController
 from camera import Camera
+from world_store import WorldStore
+from sim_clock import SimClock
 from sound_system import SoundSystem
 from pause_menu import PauseMenu
+from offline_progress import aplicar_progresso_offline, segundos_desde_save
 
 def inicializar_jogo():
     escolha_menu = mostrar_menu()
@@ -31,11 +34,13 @@ def inicializar_jogo():
     
     sprites = carregar_sprites()
     player = Player(x=100, y=100)
-    farm_system = FarmSystem()
-    water_system = WaterSystem()
-    worker_system = WorkerSystem()
+    relogio = SimClock()
+    mundo = WorldStore()
+    farm_system = FarmSystem(mundo, relogio)
+    water_system = WaterSystem(mundo)
+    worker_system = WorkerSystem(relogio)
     shop = Shop(LARGURA, ALTURA)
-    ui = UI()
+    ui = UI(relogio)
     controller = GameController(player, farm_system, water_system)
     camera = Camera(player)
     pause_menu = PauseMenu(LARGURA, ALTURA)
@@ -43,13 +48,26 @@ def inicializar_jogo():
     estado_tela = {'fullscreen': False, 'largura': LARGURA, 'altura': ALTURA}
     
     if escolha_menu == "continuar":
-        carregar_jogo(player, farm_system, water_system, worker_system)
+        carregar_jogo(player, farm_system, water_system, worker_system, relogio)
     
-    return tela, sprites, player, farm_system, water_system, worker_system, shop, ui, controller, camera, estado_tela, sound_system, pause_menu
+    return tela, sprites, player, farm_system, water_system, worker_system, shop, ui, controller, camera, estado_tela, sound_system, pause_menu, relogio
 
-def carregar_jogo(player, farm_system, water_system, worker_system):
-    dados_carregados = SaveSystem.load_game()
+def carregar_jogo(player, farm_system, water_system, worker_system, relogio, caminho=None, tempo_offline=None):
+    """
+    Carrega o save nos sistemas. Com PROGRESSO_OFFLINE (ou tempo_offline em segundos),
+    o mundo é avançado antes pelo tempo em que o jogo ficou fechado.
+    """
+    dados_carregados = SaveSystem.load_game(relogio, caminho)
     if dados_carregados:
+        if tempo_offline is None and PROGRESSO_OFFLINE:
+            tempo_offline = segundos_desde_save(dados_carregados['data_save'])
+        if tempo_offline:
+            resumo = aplicar_progresso_offline(dados_carregados, tempo_offline, relogio.agora())
+            print(f"Progresso offline ({resumo['segundos']:.0f}s): {resumo['colhidas']} colheitas "
+                  f"(+${resumo['receita']}), salários -${resumo['salarios']}, "
+                  f"{resumo['removidas']} plantas apodreceram")
+            if resumo['trabalhadores_parados']:
+                print(f"{resumo['trabalhadores_parados']} trabalhadores pararam por falta de pagamento")
         player.carregar_dados(dados_carregados['dinheiro'], dados_carregados['sementes'])
         farm_system.carregar_dados(dados_carregados['fazenda'], dados_carregados.get('terra_adubada', []))
         water_system.carregar_dados(dados_carregados.get('buracos_com_agua', []), 
@@ -57,12 +75,16 @@ def carregar_jogo(player, farm_system, water_system, worker_system):
                                     dados_carregados.get('pocos', None))
         worker_system.carregar_dados(dados_carregados.get('trabalhadores', []))
         print(f"Jogo carregado! Data: {dados_carregados['data_save']}")
+        return True
     else:
         print("Erro ao carregar jogo, iniciando novo jogo...")
+        return False
 
-def processar_eventos(controller, shop, player, ui, farm_system, water_system, worker_system, tela, estado_tela, pause_menu, sound_system):
+def processar_eventos(controller, shop, player, ui, farm_system, water_system, worker_system, tela, estado_tela, pause_menu, sound_system, relogio):
     for evento in pygame.event.get():
         if evento.type == pygame.QUIT:
+            # Ao fechar, o save é síncrono: espera os saves em segundo plano e grava o estado final
+            SaveSystem.aguardar_salvamentos()
             if SaveSystem.save_game(player, farm_system, water_system, worker_system):
                 print("Jogo salvo automaticamente!")
             return False, tela, None
@@ -78,10 +100,13 @@ def processar_eventos(controller, shop, player, ui, farm_system, water_system, w
             if evento.key == pygame.K_ESCAPE:
                 if pause_menu.aberto:
                     pause_menu.fechar()
+                    relogio.retomar()
                 elif shop.aberta:
                     shop.toggle()
                 else:
+                    # A simulação fica parada enquanto o menu de pausa estiver aberto
                     pause_menu.abrir()
+                    relogio.pausar()
             
             elif evento.key == pygame.K_F11 and not pause_menu.aberto and not shop.aberta:
                 estado_tela['fullscreen'] = not estado_tela['fullscreen']
@@ -111,7 +136,7 @@ def processar_eventos(controller, shop, player, ui, farm_system, water_system, w
                 processar_eventos_loja(evento, shop, player, ui, worker_system)
             
             elif not shop.aberta:
-                processar_eventos_jogo(evento, controller, player, ui, farm_system, water_system, worker_system)
+                processar_eventos_jogo(evento, controller, player, ui, farm_system, water_system, worker_system, relogio)
     
     return True, tela, None
 
@@ -129,10 +154,8 @@ def processar_eventos_pausa(evento, pause_menu, player, farm_system, water_syste
         elif evento.key == pygame.K_RETURN:
             resultado = pause_menu.selecionar_opcao()
             if resultado == "salvar":
-                if SaveSystem.save_game(player, farm_system, water_system, worker_system):
-                    print("Jogo salvo com sucesso!")
-                else:
-                    print("Erro ao salvar jogo!")
+                # A confirmação chega pelo laço principal quando a gravação terminar
+                SaveSystem.save_game_async(player, farm_system, water_system, worker_system)
             elif resultado == "menu":
                 sound_system.parar_musica()
                 return "menu"
@@ -183,7 +206,7 @@ def processar_eventos_loja(evento, shop, player, ui, worker_system):
                 print("Dinheiro insuficiente!")
                 ui.mostrar_mensagem_save("Dinheiro insuficiente!")
 
-def processar_eventos_jogo(evento, controller, player, ui, farm_system, water_system, worker_system):
+def processar_eventos_jogo(evento, controller, player, ui, farm_system, water_system, worker_system, relogio):
     if evento.key == pygame.K_a:
         modo = controller.alternar_modo('adubar')
         print(f"Modo: {modo}")
@@ -216,15 +239,29 @@ def processar_eventos_jogo(evento, controller, player, ui, farm_system, water_sy
                 ui.mostrar_mensagem_save("Não pode colocar poço na água!")
         else:
             ui.mostrar_mensagem_save("Você não tem poço para posicionar!")
+    elif evento.key == pygame.K_t:
+        # Alternar velocidade da simulação
+        indice = ESCALAS_TEMPO.index(relogio.escala) if relogio.escala in ESCALAS_TEMPO else -1
+        relogio.definir_escala(ESCALAS_TEMPO[(indice + 1) % len(ESCALAS_TEMPO)])
+        ui.mostrar_mensagem_save(f"Velocidade: {relogio.escala}x")
+        print(f"Velocidade da simulação: {relogio.escala}x")
     elif evento.key == pygame.K_s:
-        if SaveSystem.save_game(player, farm_system, water_system, worker_system):
+        # A confirmação chega pelo laço principal quando a gravação terminar
+        SaveSystem.save_game_async(player, farm_system, water_system, worker_system)
+
+def verificar_salvamento(ui):
+    """Mostra o resultado dos saves feitos em segundo plano que terminaram desde o último quadro"""
+    resultado = SaveSystem.obter_resultado_salvamento()
+    while resultado is not None:
+        if resultado:
             ui.mostrar_mensagem_save("Jogo salvo com sucesso!")
             print("Jogo salvo!")
         else:
             ui.mostrar_mensagem_save("Erro ao salvar jogo!")
             print("Erro ao salvar!")
+        resultado = SaveSystem.obter_resultado_salvamento()
 
-def atualizar_jogo(controller, farm_system, water_system, worker_system, player, shop, sprites, camera, estado_tela, pause_menu):
+def atualizar_jogo(controller, farm_system, water_system, worker_system, player, shop, sprites, camera, estado_tela, pause_menu, relogio, dt_real):
     if not shop.aberta and not pause_menu.aberto:
         teclas = pygame.key.get_pressed()
         controller.processar_movimento(teclas, estado_tela['largura'], estado_tela['altura'])
@@ -233,7 +270,12 @@ def atualizar_jogo(controller, farm_system, water_system, worker_system, player,
             controller.executar_acao()
     
     camera.atualizar(estado_tela['largura'], estado_tela['altura'])
-    water_system.atualizar_terra_aguada()
+    
+    # Simulação em passos fixos, independente da taxa de quadros
+    for _ in relogio.passos(dt_real):
+        atualizar_simulacao(farm_system, water_system, worker_system, player)
+
+def atualizar_simulacao(farm_system, water_system, worker_system, player):
     farm_system.atualizar_plantas(water_system)
     worker_system.atualizar_trabalhadores(farm_system, water_system, player)
 
@@ -241,6 +283,15 @@ def desenhar_jogo(tela, sprites, player, farm_system, water_system, worker_syste
     largura_atual = estado_tela['largura']
     altura_atual = estado_tela['altura']
     
+    if pause_menu.cena_congelada():
+        # Atrás do menu de pausa fica a cena capturada ao abrir: nada do jogo é redesenhado,
+        # só a mensagem de save por cima dela (como no quadro em que o menu abriu)
+        ui.regioes.marcar(pause_menu.desenhar(tela))
+        ui.desenhar_mensagem_save(tela, largura_atual)
+        ui.marcar_menus(shop.aberta, shop.aba_atual, pause_menu.aberto)
+        ui.atualizar_display(tela)
+        return
+    
     ui.desenhar_cenario(tela, sprites, water_system, farm_system, largura_atual, altura_atual, camera)
     
     ui.desenhar_trabalhadores(tela, worker_system, sprites, camera)
@@ -255,31 +306,38 @@ def desenhar_jogo(tela, sprites, player, farm_system, water_system, worker_syste
     ui.desenhar_interface(tela, player, water_system, controller.get_modo_atual())
     
     if shop.aberta:
-        shop.desenhar(tela, worker_system)
+        ui.regioes.marcar(shop.desenhar(tela, worker_system))
     
-    pause_menu.desenhar(tela)
+    if pause_menu.aberto:
+        ui.regioes.marcar(pause_menu.desenhar(tela))
+        ui.desenhar_mensagem_save(tela, largura_atual)
     
-    pygame.display.update()
+    ui.marcar_menus(shop.aberta, shop.aba_atual, pause_menu.aberto)
+    ui.atualizar_display(tela)
 
 def main():
-    tela, sprites, player, farm_system, water_system, worker_system, shop, ui, controller, camera, estado_tela, sound_system, pause_menu = inicializar_jogo()
-    relogio = pygame.time.Clock()
+    tela, sprites, player, farm_system, water_system, worker_system, shop, ui, controller, camera, estado_tela, sound_system, pause_menu, relogio = inicializar_jogo()
+    relogio_quadros = pygame.time.Clock()
+    dt_real = 0
     rodando = True
     
     while rodando:
-        rodando, tela, resultado = processar_eventos(controller, shop, player, ui, farm_system, water_system, worker_system, tela, estado_tela, pause_menu, sound_system)
+        rodando, tela, resultado = processar_eventos(controller, shop, player, ui, farm_system, water_system, worker_system, tela, estado_tela, pause_menu, sound_system, relogio)
+        verificar_salvamento(ui)
         
         if resultado == "menu":
+            SaveSystem.aguardar_salvamentos()
             sound_system.parar_musica()
             pygame.quit()
             # Reiniciar o menu
             main()
             return
         
-        atualizar_jogo(controller, farm_system, water_system, worker_system, player, shop, sprites, camera, estado_tela, pause_menu)
+        atualizar_jogo(controller, farm_system, water_system, worker_system, player, shop, sprites, camera, estado_tela, pause_menu, relogio, dt_real)
         desenhar_jogo(tela, sprites, player, farm_system, water_system, worker_system, shop, ui, controller, camera, estado_tela, pause_menu)
-        relogio.tick(FPS)
+        dt_real = relogio_quadros.tick(FPS) / 1000
     
+    SaveSystem.aguardar_salvamentos()
     pygame.quit()
     sys.exit()
 
@@ -2,6 +2,7 @@ import pygame
 import sys
 from save_system import SaveSystem
 from sound_system import SoundSystem
+from text_cache import renderizar_texto
 
 class Menu:
     
@@ -30,10 +31,9 @@ class Menu:
         self.opcoes = []
         self.opcao_selecionada = 0
         
-        self.save_existe = SaveSystem.save_exists()
+        # Resumo de cada slot vindo do índice de saves, sem abrir os arquivos
+        self.slots = SaveSystem.listar_slots()
         self._configurar_opcoes()
-        
-        self.save_info = SaveSystem.get_save_info() if self.save_existe else None
     
     def _desenhar_background_grama(self):
         """Desenha a textura de grama repetida como background"""
@@ -45,49 +45,56 @@ class Menu:
                 self.tela.blit(self.grama, (x, y))
     
     def _configurar_opcoes(self):
-        if self.save_existe:
-            self.opcoes = [
-                {"texto": "Continuar Jogo", "acao": "continuar"},
-                {"texto": "Novo Jogo", "acao": "novo"},
-                {"texto": "Deletar Save", "acao": "deletar"},
-                {"texto": "Sair", "acao": "sair"}
-            ]
-        else:
-            self.opcoes = [
-                {"texto": "Novo Jogo", "acao": "novo"},
-                {"texto": "Sair", "acao": "sair"}
-            ]
+        numerados = [str(numero) for numero in range(1, SaveSystem.NUM_SLOTS + 1)]
+        nomes = numerados + sorted(slot for slot in self.slots if slot not in numerados)
+        
+        self.opcoes = []
+        for slot in nomes:
+            info = self.slots.get(slot)
+            if info:
+                texto = f"Slot {slot} - ${info['dinheiro']} - {info['total_plantas']} plantas"
+                self.opcoes.append({"texto": texto, "acao": "continuar", "slot": slot})
+            else:
+                self.opcoes.append({"texto": f"Slot {slot} - Vazio", "acao": "novo", "slot": slot})
+        self.opcoes.append({"texto": "Sair", "acao": "sair"})
+        self.opcao_selecionada = min(self.opcao_selecionada, len(self.opcoes) - 1)
+    
+    def _info_selecionada(self):
+        slot = self.opcoes[self.opcao_selecionada].get("slot")
+        return self.slots.get(slot) if slot is not None else None
     
     def desenhar(self):
         self._desenhar_background_grama()
         
-        titulo = self.fonte_titulo.render("Mundo da Roça", True, self.cor_titulo)
+        titulo = renderizar_texto(self.fonte_titulo, "Mundo da Roça", True, self.cor_titulo)
         titulo_rect = titulo.get_rect(center=(self.largura // 2, 100))
         self.tela.blit(titulo, titulo_rect)
         
-        subtitulo = self.fonte_info.render("Simulador Agrícola 2D", True, self.cor_info)
+        subtitulo = renderizar_texto(self.fonte_info, "Simulador Agrícola 2D", True, self.cor_info)
         subtitulo_rect = subtitulo.get_rect(center=(self.largura // 2, 150))
         self.tela.blit(subtitulo, subtitulo_rect)
         
-        if self.save_info:
+        info = self._info_selecionada()
+        if info:
             y_info = 200
             info_texts = [
-                f"Ultimo Save: {self.save_info['data_save']}",
-                f"Dinheiro: ${self.save_info['dinheiro']}",
-                f"Plantas na fazenda: {self.save_info['total_plantas']}"
+                f"Ultimo Save: {info['data_save']}",
+                f"Dinheiro: ${info['dinheiro']}",
+                f"Plantas na fazenda: {info['total_plantas']}",
+                f"Trabalhadores: {info['total_trabalhadores']} | Tamanho: {info['tamanho'] / 1024:.0f} KB"
             ]
             
             for texto in info_texts:
-                info_surface = self.fonte_info.render(texto, True, self.cor_destaque)
+                info_surface = renderizar_texto(self.fonte_info, texto, True, self.cor_destaque)
                 info_rect = info_surface.get_rect(center=(self.largura // 2, y_info))
                 self.tela.blit(info_surface, info_rect)
                 y_info += 25
         
-        y_offset = 320 if self.save_info else 250
+        y_offset = 320
         
         for i, opcao in enumerate(self.opcoes):
             cor = self.cor_opcao_selecionada if i == self.opcao_selecionada else self.cor_opcao
-            texto_surface = self.fonte_opcao.render(opcao["texto"], True, cor)
+            texto_surface = renderizar_texto(self.fonte_opcao, opcao["texto"], True, cor)
             texto_rect = texto_surface.get_rect(center=(self.largura // 2, y_offset))
             
             if i == self.opcao_selecionada:
@@ -104,12 +111,12 @@ class Menu:
             y_offset += 60
         
         instrucoes = [
-            "Use as setas para navegar",
-            "Pressione ENTER para selecionar"
+            "Use as setas para navegar e ENTER para jogar no slot",
+            "N: novo jogo no slot | DELETE: deletar o save do slot"
         ]
         y_instrucao = self.altura - 80
         for instrucao in instrucoes:
-            texto = self.fonte_info.render(instrucao, True, self.cor_info)
+            texto = renderizar_texto(self.fonte_info, instrucao, True, self.cor_info)
             texto_rect = texto.get_rect(center=(self.largura // 2, y_instrucao))
             self.tela.blit(texto, texto_rect)
             y_instrucao += 25
@@ -126,9 +133,12 @@ class Menu:
     
     def selecionar_opcao(self):
         self.sound_system.tocar_sfx('select')
-        return self.opcoes[self.opcao_selecionada]["acao"]
+        opcao = self.opcoes[self.opcao_selecionada]
+        if "slot" in opcao:
+            SaveSystem.usar_slot(opcao["slot"])
+        return opcao["acao"]
     
-    def confirmar_delecao(self):
+    def confirmar_delecao(self, titulo_texto="Deletar Save?"):
         confirmando = True
         opcao_confirmacao = 0
         
@@ -149,11 +159,11 @@ class Menu:
             
             self._desenhar_background_grama()
             
-            titulo = self.fonte_opcao.render("Deletar Save?", True, self.cor_titulo)
+            titulo = renderizar_texto(self.fonte_opcao, titulo_texto, True, self.cor_titulo)
             titulo_rect = titulo.get_rect(center=(self.largura // 2, 200))
             self.tela.blit(titulo, titulo_rect)
             
-            aviso = self.fonte_info.render("Esta ação não pode ser desfeita!", True, (255, 100, 100))
+            aviso = renderizar_texto(self.fonte_info, "Esta ação não pode ser desfeita!", True, (255, 100, 100))
             aviso_rect = aviso.get_rect(center=(self.largura // 2, 250))
             self.tela.blit(aviso, aviso_rect)
             
@@ -161,7 +171,7 @@ class Menu:
             y_offset = 320
             for i, opcao in enumerate(opcoes_conf):
                 cor = self.cor_opcao_selecionada if i == opcao_confirmacao else self.cor_opcao
-                texto = self.fonte_opcao.render(opcao, True, cor)
+                texto = renderizar_texto(self.fonte_opcao, opcao, True, cor)
                 texto_rect = texto.get_rect(center=(self.largura // 2 - 100 + i * 200, y_offset))
                 
                 if i == opcao_confirmacao:
@@ -171,7 +181,7 @@ class Menu:
                 
                 self.tela.blit(texto, texto_rect)
             
-            instrucao = self.fonte_info.render("Setas: Navegar | ENTER: Confirmar | ESC: Cancelar", 
+            instrucao = renderizar_texto(self.fonte_info, "Setas: Navegar | ENTER: Confirmar | ESC: Cancelar", 
                                               True, self.cor_info)
             instrucao_rect = instrucao.get_rect(center=(self.largura // 2, self.altura - 50))
             self.tela.blit(instrucao, instrucao_rect)
@@ -196,17 +206,17 @@ class Menu:
                     elif evento.key == pygame.K_DOWN:
                         self.navegar_baixo()
                     elif evento.key == pygame.K_RETURN:
-                        acao = self.selecionar_opcao()
-                        
-                        if acao == "deletar":
-                            if self.confirmar_delecao():
-                                SaveSystem.delete_save()
-                                self.save_existe = False
-                                self.save_info = None
-                                self._configurar_opcoes()
-                                self.opcao_selecionada = 0
-                        else:
-                            return acao
+                        return self.selecionar_opcao()
+                    elif evento.key == pygame.K_n and self._info_selecionada():
+                        # Novo jogo num slot ocupado: o save antigo só é substituído no primeiro save
+                        if self.confirmar_delecao("Sobrescrever Save?"):
+                            SaveSystem.usar_slot(self.opcoes[self.opcao_selecionada]["slot"])
+                            return "novo"
+                    elif evento.key in (pygame.K_DELETE, pygame.K_BACKSPACE) and self._info_selecionada():
+                        if self.confirmar_delecao():
+                            SaveSystem.delete_save(self.opcoes[self.opcao_selecionada]["slot"])
+                            self.slots = SaveSystem.listar_slots()
+                            self._configurar_opcoes()
                     elif evento.key == pygame.K_ESCAPE:
                         return "sair"
             
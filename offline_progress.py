@@ -0,0 +1,103 @@
+"""
+Progresso offline: avança um save carregado pelo tempo em que o jogo ficou fechado.
+
+Nada é simulado tick a tick. O estágio final de cada planta é calculado direto
+pelo tempo decorrido e pelo fator de crescimento, e os trabalhadores são
+estimados em bloco: os coletadores colhem as plantas que amadurecem no período
+(até a capacidade deles) e os salários são cobrados enquanto houver dinheiro.
+Cultivadores e adubadores não são estimados; voltam ao trabalho depois de carregar.
+"""
+from datetime import datetime
+from itertools import accumulate
+from config import TIPOS_SEMENTE
+from farm_system import FarmSystem
+from worker_system import INTERVALO_PAGAMENTO, CUSTO_MANUTENCAO
+
+TEMPO_MEDIO_COLHEITA = 2.0  # Segundos por colheita de um coletador, contando o deslocamento
+ITERACOES_SALARIOS = 4
+
+
+def segundos_desde_save(data_save, agora=None):
+    """Tempo real desde a data gravada no save, ou 0 se ela não puder ser lida"""
+    try:
+        momento = datetime.strptime(data_save, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return 0.0
+    agora = agora or datetime.now()
+    return max(0.0, (agora - momento).total_seconds())
+
+
+def aplicar_progresso_offline(dados, segundos, tempo_atual):
+    """
+    Avança `segundos` no dicionário retornado por SaveSystem.load_game, antes de ele
+    ser carregado nos sistemas. Retorna um resumo do que aconteceu no período.
+    """
+    resumo = {'segundos': segundos, 'colhidas': 0, 'receita': 0, 'salarios': 0,
+              'removidas': 0, 'trabalhadores_parados': 0}
+    if segundos <= 0:
+        return resumo
+    fazenda = dados['fazenda']
+    
+    # Plantas que passam pelo estágio maduro durante o período, ordenadas pelo prazo até estragarem
+    candidatas = []
+    for posicao, planta in fazenda.items():
+        if planta.estragada:
+            continue
+        tempo_crescimento = TIPOS_SEMENTE[planta.tipo]['tempo_crescimento'] * planta.fator_crescimento
+        inicio = tempo_atual - planta.tempo_plantio
+        fim = inicio + segundos
+        if inicio < tempo_crescimento * 8 and fim >= tempo_crescimento * 5:
+            prazo = min(tempo_crescimento * 8, fim) - inicio
+            candidatas.append((prazo, posicao, TIPOS_SEMENTE[planta.tipo]['valor_colheita']))
+    candidatas.sort()
+    receitas = [0] + list(accumulate(valor for _, _, valor in candidatas))
+    
+    trabalhadores = dados.get('trabalhadores', [])
+    ativos = [trabalhador for trabalhador in trabalhadores if trabalhador.get('ativo', True)]
+    coletadores = sum(1 for trabalhador in ativos if trabalhador['tipo'] == 'coletador')
+    capacidade = coletadores * segundos / TEMPO_MEDIO_COLHEITA
+    salarios_devidos = len(ativos) * int(segundos // INTERVALO_PAGAMENTO) * CUSTO_MANUTENCAO
+    
+    # Sem dinheiro para todos os salários, os trabalhadores param antes do fim do período
+    # e colhem menos, o que reduz de novo o dinheiro disponível: algumas iterações bastam
+    fracao_paga = 1.0
+    for _ in range(ITERACOES_SALARIOS):
+        colhidas = min(len(candidatas), int(capacidade * fracao_paga))
+        disponivel = dados['dinheiro'] + receitas[colhidas]
+        if salarios_devidos <= disponivel:
+            salarios = salarios_devidos
+            break
+        fracao_paga = disponivel / salarios_devidos
+    else:
+        colhidas = min(len(candidatas), int(capacidade * fracao_paga))
+        disponivel = dados['dinheiro'] + receitas[colhidas]
+        salarios = min(salarios_devidos, int(disponivel // CUSTO_MANUTENCAO) * CUSTO_MANUTENCAO)
+    
+    if salarios < salarios_devidos:
+        for trabalhador in ativos:
+            trabalhador['ativo'] = False
+        resumo['trabalhadores_parados'] = len(ativos)
+    for trabalhador in trabalhadores:
+        trabalhador['ultimo_pagamento'] = tempo_atual - segundos % INTERVALO_PAGAMENTO
+    
+    colhidas_posicoes = {posicao for _, posicao, _ in candidatas[:colhidas]}
+    for posicao in colhidas_posicoes:
+        del fazenda[posicao]
+    if colhidas_posicoes:
+        dados['terra_adubada'] = [pos for pos in dados.get('terra_adubada', []) if tuple(pos) not in colhidas_posicoes]
+    dados['dinheiro'] += receitas[colhidas] - salarios
+    
+    # As demais plantas envelhecem o período inteiro
+    for posicao, planta in list(fazenda.items()):
+        planta.tempo_plantio -= segundos
+        if planta.estragada:
+            continue
+        estagio, remover = FarmSystem.estado_apos(planta, tempo_atual - planta.tempo_plantio)
+        if remover:
+            del fazenda[posicao]
+            resumo['removidas'] += 1
+        else:
+            planta.estagio = estagio
+    
+    resumo.update(colhidas=colhidas, receita=receitas[colhidas], salarios=salarios)
+    return resumo
@@ -1,6 +1,7 @@
 import pygame
 from save_system import SaveSystem
 from sound_system import SoundSystem
+from text_cache import renderizar_texto
 
 
 class PauseMenu:
@@ -32,6 +33,11 @@ class PauseMenu:
         self.opcao_selecionada = 0
         self.slider_selecionado = None
         self.atualizar_valores_sliders()
+        
+        # Superfícies reaproveitadas entre quadros enquanto o menu está aberto
+        self._fundo = None
+        self._painel = None
+        self._chave_painel = None
     
     def atualizar_valores_sliders(self):
         """Atualiza os valores dos sliders com base no sistema de som"""
@@ -42,10 +48,12 @@ class PauseMenu:
         """Atualiza as dimensões quando a janela é redimensionada"""
         self.largura = largura
         self.altura = altura
+        self._fundo = None
     
     def abrir(self):
         """Abre o menu de pausa"""
         self.aberto = True
+        self._fundo = None
         self.opcao_selecionada = 0
         self.slider_selecionado = None
         self.atualizar_valores_sliders()
@@ -53,6 +61,7 @@ class PauseMenu:
     def fechar(self):
         """Fecha o menu de pausa"""
         self.aberto = False
+        self._fundo = None
     
     def navegar_cima(self):
         """Navega para cima no menu"""
@@ -102,54 +111,81 @@ class PauseMenu:
         
         return None
     
+    def obter_rect(self):
+        """Área da tela ocupada pelo painel do menu"""
+        largura_menu = 600
+        altura_menu = 450
+        return pygame.Rect((self.largura - largura_menu) // 2, (self.altura - altura_menu) // 2, largura_menu, altura_menu)
+    
     def desenhar(self, tela):
-        """Desenha o menu de pausa"""
+        """Desenha o menu de pausa e retorna a área da tela que pode ter mudado"""
         if not self.aberto:
-            return
+            return None
+        
+        if self._fundo is None:
+            # A cena atual é capturada uma vez e fica congelada enquanto o menu estiver aberto
+            self._fundo = self._compor_fundo(tela)
+        
+        chave = (self.opcao_selecionada, tuple(opcao.get("valor") for opcao in self.opcoes))
+        if chave != self._chave_painel:
+            self._painel = self._renderizar_painel()
+            self._chave_painel = chave
+        
+        tela.blit(self._fundo, (0, 0))
+        return tela.blit(self._painel, self.obter_rect().topleft)
+    
+    def cena_congelada(self):
+        """Indica se a cena do jogo atrás do menu já foi capturada e não precisa ser redesenhada"""
+        return self.aberto and self._fundo is not None
+    
+    def _compor_fundo(self, tela):
+        fundo = tela.copy()
         
         superficie_fundo = pygame.Surface((self.largura, self.altura))
         superficie_fundo.set_alpha(180)
         superficie_fundo.fill((0, 0, 0))
-        tela.blit(superficie_fundo, (0, 0))
+        fundo.blit(superficie_fundo, (0, 0))
         
-        largura_menu = 600
-        altura_menu = 450
-        x_menu = (self.largura - largura_menu) // 2
-        y_menu = (self.altura - altura_menu) // 2
+        instrucoes = "↑↓: Navegar | ←→: Volume | ENTER: Selecionar | ESC: Continuar"
+        texto_inst = renderizar_texto(self.fonte_pequena, instrucoes, True, (150, 150, 150))
+        texto_inst_rect = texto_inst.get_rect(center=(self.largura // 2, self.altura - 40))
+        fundo.blit(texto_inst, texto_inst_rect)
+        return fundo
+    
+    def _renderizar_painel(self):
+        """Desenha o painel numa Surface própria, com margem à direita para o percentual dos sliders"""
+        largura_menu, altura_menu = self.obter_rect().size
+        painel = pygame.Surface((largura_menu + 60, altura_menu), pygame.SRCALPHA)
         
-        pygame.draw.rect(tela, (50, 50, 50), (x_menu, y_menu, largura_menu, altura_menu))
-        pygame.draw.rect(tela, (200, 200, 200), (x_menu, y_menu, largura_menu, altura_menu), 3)
+        pygame.draw.rect(painel, (50, 50, 50), (0, 0, largura_menu, altura_menu))
+        pygame.draw.rect(painel, (200, 200, 200), (0, 0, largura_menu, altura_menu), 3)
         
-        titulo = self.fonte_titulo.render("PAUSA", True, self.cor_texto)
-        titulo_rect = titulo.get_rect(center=(self.largura // 2, y_menu + 30))
-        tela.blit(titulo, titulo_rect)
+        titulo = renderizar_texto(self.fonte_titulo, "PAUSA", True, self.cor_texto)
+        titulo_rect = titulo.get_rect(center=(largura_menu // 2, 30))
+        painel.blit(titulo, titulo_rect)
         
-        y_offset = y_menu + 100
+        y_offset = 100
         for i, opcao in enumerate(self.opcoes):
             cor = self.cor_selecionada if i == self.opcao_selecionada else self.cor_texto
             
             if opcao["tipo"] == "slider":
-                self._desenhar_slider(tela, opcao, i, x_menu, y_offset, largura_menu, cor)
+                self._desenhar_slider(painel, opcao, i, 0, y_offset, largura_menu, cor)
             else:
-                texto = self.fonte_opcao.render(opcao["texto"], True, cor)
-                texto_rect = texto.get_rect(center=(self.largura // 2, y_offset))
-                tela.blit(texto, texto_rect)
+                texto = renderizar_texto(self.fonte_opcao, opcao["texto"], True, cor)
+                texto_rect = texto.get_rect(center=(largura_menu // 2, y_offset))
+                painel.blit(texto, texto_rect)
                 
                 if i == self.opcao_selecionada:
-                    pygame.draw.rect(tela, cor, 
+                    pygame.draw.rect(painel, cor, 
                                    (texto_rect.left - 20, texto_rect.top - 5,
                                     texto_rect.width + 40, texto_rect.height + 10), 2)
             
             y_offset += 80
-        
-        instrucoes = "↑↓: Navegar | ←→: Volume | ENTER: Selecionar | ESC: Continuar"
-        texto_inst = self.fonte_pequena.render(instrucoes, True, (150, 150, 150))
-        texto_inst_rect = texto_inst.get_rect(center=(self.largura // 2, self.altura - 40))
-        tela.blit(texto_inst, texto_inst_rect)
+        return painel
     
     def _desenhar_slider(self, tela, opcao, indice, x_menu, y_offset, largura_menu, cor):
         """Desenha um slider para controle de volume"""
-        label = self.fonte_opcao.render(opcao["texto"], True, cor)
+        label = renderizar_texto(self.fonte_opcao, opcao["texto"], True, cor)
         label_rect = label.get_rect(topleft=(x_menu + 50, y_offset))
         tela.blit(label, label_rect)
         
@@ -165,6 +201,6 @@ class PauseMenu:
         pygame.draw.rect(tela, self.cor_slider_barra, (slider_x, slider_y, valor_preenchido, slider_altura))
         
         percentual = int(opcao["valor"] * 100)
-        texto_valor = self.fonte_pequena.render(f"{percentual}%", True, cor)
+        texto_valor = renderizar_texto(self.fonte_pequena, f"{percentual}%", True, cor)
         texto_valor_rect = texto_valor.get_rect(topleft=(slider_x + slider_largura + 20, slider_y + 2))
         tela.blit(texto_valor, texto_valor_rect)
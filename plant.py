@@ -0,0 +1,28 @@
+from enum import StrEnum
+from config import TIPOS_SEMENTE
+
+# Um membro por tipo de TIPOS_SEMENTE (ex: TipoSemente.MILHO == 'milho').
+# Como str, serve direto de chave em TIPOS_SEMENTE, nas sementes do jogador e no atlas,
+# e todas as plantas do mesmo tipo apontam para o mesmo objeto.
+TipoSemente = StrEnum('TipoSemente', {tipo.upper(): tipo for tipo in TIPOS_SEMENTE}, module=__name__)
+
+
+class Planta:
+    """
+    Uma planta da fazenda (valor das camadas FarmSystem.fazenda / WorldStore.fazenda).
+    Com __slots__, cada planta ocupa bem menos memória que um dict e o acesso aos
+    campos nos loops de atualização é mais rápido.
+    tipo deve ser um TipoSemente; use TipoSemente(texto) ao converter de fora (saves, jogador).
+    """
+    __slots__ = ('tipo', 'estagio', 'tempo_plantio', 'estragada', 'fator_crescimento')
+    
+    def __init__(self, tipo, estagio=1, tempo_plantio=0.0, estragada=False, fator_crescimento=1.0):
+        self.tipo = tipo
+        self.estagio = estagio
+        self.tempo_plantio = tempo_plantio
+        self.estragada = estragada
+        self.fator_crescimento = fator_crescimento
+    
+    def __repr__(self):
+        return (f"Planta({self.tipo!r}, estagio={self.estagio}, tempo_plantio={self.tempo_plantio}, "
+                f"estragada={self.estragada}, fator_crescimento={self.fator_crescimento})")
@@ -9,6 +9,7 @@ class Player:
         self.sementes = {'milho': 20, 'tomate': 10, 'alface': 30}
         self.semente_selecionada = 'milho'
         self.tem_poco = False  # Indica se o jogador comprou um poço para posicionar
+        self.versao = 0  # Incrementada a cada mudança de dinheiro/sementes, usada pela interface
     
     def mover(self, teclas, largura=None, altura=None):
         # Mapa infinito - sem restrições de borda
@@ -33,19 +34,28 @@ class Player:
         sementes_list = ['milho', 'tomate', 'alface']
         if 0 <= numero < len(sementes_list):
             self.semente_selecionada = sementes_list[numero]
+            self.versao += 1
     
     def adicionar_dinheiro(self, valor):
         self.dinheiro += valor
+        self.versao += 1
     
     def gastar_dinheiro(self, valor):
         if self.dinheiro >= valor:
             self.dinheiro -= valor
+            self.versao += 1
             return True
         return False
     
     def adicionar_sementes(self, tipo, quantidade):
         self.sementes[tipo] += quantidade
+        self.versao += 1
+    
+    def marcar_alterado(self):
+        """Sinaliza mudanças feitas fora destes métodos (ex: semente gasta no plantio)"""
+        self.versao += 1
     
     def carregar_dados(self, dinheiro, sementes):
         self.dinheiro = dinheiro
         self.sementes = sementes
+        self.versao += 1
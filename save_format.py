@@ -0,0 +1,232 @@
+"""
+Formato binário dos saves.
+
+Layout (little-endian):
+    cabeçalho: MAGICO (4 bytes) | versão (uint16) | compressão (uint8) | reservado (uint8)
+    resumo (versão 2+, sem compressão): geração do save (uint64) | dinheiro (int64) |
+        total de plantas (uint32) | total de trabalhadores (uint32) | data do save (19 bytes)
+    corpo (comprimido conforme o cabeçalho), uma sequência de blocos "tamanho (uint32) + bytes":
+        meta JSON (dinheiro, sementes, data, lista de tipos de semente, trabalhadores
+                   com o tempo desde o último pagamento, tempo do relógio da sessão)
+        plantas: x, y (int32), tipo, estágio, estragada (uint8), fator (float32), tempo decorrido (float64)
+        terra adubada: x, y (int32)
+        buracos com água: x, y (int32)
+        poços: x, y (int32)
+        [só nas entradas do diário] posições alteradas: x, y (int32)
+A terra aguada não é gravada: é refeita a partir dos buracos ao carregar.
+O resumo tem posição e tamanho fixos para o menu mostrar o save lendo só o início do arquivo.
+"""
+import json
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from plant import Planta, TipoSemente
+
+MAGICO = b'MRSV'
+VERSAO = 2
+CABECALHO = struct.Struct('<4sHBB')
+RESUMO = struct.Struct('<QqII19s')
+TAMANHO_INICIO = CABECALHO.size + RESUMO.size  # Bytes necessários para ler_resumo
+TAMANHO_BLOCO = struct.Struct('<I')
+
+COMPRESSOES = {'nenhuma': 0, 'zlib': 1, 'lzma': 2}
+COMPRESSAO_PADRAO = 'zlib'
+
+INT32 = 'i' if array('i').itemsize == 4 else 'l'
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def eh_binario(inicio):
+    """Indica se os primeiros bytes de um arquivo são de um save binário"""
+    return inicio[:len(MAGICO)] == MAGICO
+
+
+def _bytes_array(valores):
+    if _BIG_ENDIAN and valores.itemsize > 1:
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+
+def _ler_array(tipo, dados):
+    valores = array(tipo)
+    valores.frombytes(dados)
+    if _BIG_ENDIAN and valores.itemsize > 1:
+        valores.byteswap()
+    return valores
+
+
+def _posicoes_para_blocos(posicoes):
+    return [_bytes_array(array(INT32, [pos[0] for pos in posicoes])),
+            _bytes_array(array(INT32, [pos[1] for pos in posicoes]))]
+
+
+def _blocos_para_posicoes(xs, ys):
+    return list(zip(_ler_array(INT32, xs), _ler_array(INT32, ys)))
+
+
+def trabalhadores_no_relogio(trabalhadores, tempo_atual):
+    """
+    Converte o tempo desde o último pagamento gravado no save em ultimo_pagamento no
+    relógio atual. Saves antigos guardavam ultimo_pagamento no relógio da sessão que
+    gravou; sem como convertê-lo, ele só é limitado ao tempo atual.
+    """
+    for trabalhador in trabalhadores:
+        if 'tempo_desde_pagamento' in trabalhador:
+            trabalhador['ultimo_pagamento'] = tempo_atual - trabalhador.pop('tempo_desde_pagamento')
+        else:
+            trabalhador['ultimo_pagamento'] = min(trabalhador.get('ultimo_pagamento', tempo_atual), tempo_atual)
+    return trabalhadores
+
+
+def trabalhadores_para_save(trabalhadores, tempo_atual):
+    """Inverso de trabalhadores_no_relogio: cópias com o tempo desde o último pagamento"""
+    resultado = []
+    for trabalhador in trabalhadores:
+        trabalhador = dict(trabalhador)
+        trabalhador['tempo_desde_pagamento'] = tempo_atual - trabalhador.pop('ultimo_pagamento')
+        resultado.append(trabalhador)
+    return resultado
+
+
+def codificar(snapshot, compressao=COMPRESSAO_PADRAO):
+    """Gera os bytes do save a partir de um snapshot de SaveSystem.criar_snapshot"""
+    farm = snapshot['farm']
+    water = snapshot['water']
+    tempo_atual = farm['tempo']
+    
+    tipos = []
+    indices_tipo = {}
+    for _, tipo, _, _, _, _ in farm['plantas']:
+        if tipo not in indices_tipo:
+            indices_tipo[tipo] = len(tipos)
+            tipos.append(tipo)
+    
+    meta = {
+        'dinheiro': snapshot['dinheiro'],
+        'sementes': snapshot['sementes'],
+        'data_save': snapshot['data_save'],
+        'tipos_semente': tipos,
+        'trabalhadores': snapshot['trabalhadores'],
+        'tempo': tempo_atual
+    }
+    
+    plantas = farm['plantas']
+    blocos = [json.dumps(meta, ensure_ascii=False).encode('utf-8')]
+    blocos += _posicoes_para_blocos([planta[0] for planta in plantas])
+    blocos += [
+        _bytes_array(array('B', [indices_tipo[planta[1]] for planta in plantas])),
+        _bytes_array(array('B', [planta[2] for planta in plantas])),
+        _bytes_array(array('B', [1 if planta[4] else 0 for planta in plantas])),
+        _bytes_array(array('f', [planta[5] for planta in plantas])),
+        _bytes_array(array('d', [tempo_atual - planta[3] for planta in plantas]))
+    ]
+    blocos += _posicoes_para_blocos(farm['terra_adubada'])
+    blocos += _posicoes_para_blocos(water['buracos_com_agua'])
+    blocos += _posicoes_para_blocos(water['pocos'])
+    if 'posicoes' in snapshot:
+        blocos += _posicoes_para_blocos(snapshot['posicoes'])
+    
+    corpo = b''.join(TAMANHO_BLOCO.pack(len(bloco)) + bloco for bloco in blocos)
+    codigo = COMPRESSOES[compressao]
+    if codigo == 1:
+        corpo = zlib.compress(corpo)
+    elif codigo == 2:
+        corpo = lzma.compress(corpo)
+    resumo = RESUMO.pack(snapshot.get('geracao') or 0, int(snapshot['dinheiro']),
+                         snapshot.get('total_plantas', len(plantas)), len(snapshot['trabalhadores']),
+                         snapshot['data_save'].encode('utf-8'))
+    return CABECALHO.pack(MAGICO, VERSAO, codigo, 0) + resumo + corpo
+
+
+def ler_resumo(inicio):
+    """
+    Lê o resumo (dinheiro, data, plantas e trabalhadores) a partir dos primeiros
+    TAMANHO_INICIO bytes de um save, sem descomprimir o resto.
+    Retorna None para saves sem resumo (versão 1).
+    """
+    if len(inicio) < TAMANHO_INICIO:
+        return None
+    magico, versao, _, _ = CABECALHO.unpack_from(inicio)
+    if magico != MAGICO or versao < 2 or versao > VERSAO:
+        return None
+    geracao, dinheiro, total_plantas, total_trabalhadores, data_save = RESUMO.unpack_from(inicio, CABECALHO.size)
+    return {
+        'geracao': geracao or None,
+        'dinheiro': dinheiro,
+        'data_save': data_save.rstrip(b'\0').decode('utf-8'),
+        'total_plantas': total_plantas,
+        'total_trabalhadores': total_trabalhadores
+    }
+
+
+def decodificar(dados, tempo_atual=None):
+    """
+    Lê um save binário e retorna o mesmo dicionário que SaveSystem.load_game
+    devolve para saves JSON (posições como tuplas).
+    Sem tempo_atual, os tempos de plantio ficam no relógio da sessão que gravou o save.
+    """
+    magico, versao, codigo, _ = CABECALHO.unpack_from(dados)
+    if magico != MAGICO:
+        raise ValueError("arquivo não é um save binário")
+    if versao > VERSAO:
+        raise ValueError(f"save na versão {versao}, mais nova que a suportada ({VERSAO})")
+    
+    inicio_corpo = CABECALHO.size
+    if versao >= 2:
+        inicio_corpo += RESUMO.size
+    corpo = dados[inicio_corpo:]
+    if codigo == 1:
+        corpo = zlib.decompress(corpo)
+    elif codigo == 2:
+        corpo = lzma.decompress(corpo)
+    elif codigo != 0:
+        raise ValueError(f"compressão desconhecida: {codigo}")
+    
+    blocos = []
+    posicao = 0
+    visao = memoryview(corpo)
+    while posicao < len(corpo):
+        (tamanho,) = TAMANHO_BLOCO.unpack_from(corpo, posicao)
+        posicao += TAMANHO_BLOCO.size
+        blocos.append(visao[posicao:posicao + tamanho])
+        posicao += tamanho
+    
+    meta = json.loads(bytes(blocos[0]).decode('utf-8'))
+    tipos = [TipoSemente(tipo) for tipo in meta['tipos_semente']]
+    if versao >= 2:
+        geracao = RESUMO.unpack_from(dados, CABECALHO.size)[0] or None
+    else:
+        geracao = meta.get('geracao')  # Saves da versão 1 guardavam a geração no meta
+    if tempo_atual is None:
+        tempo_atual = meta.get('tempo', 0.0)
+    
+    posicoes = _blocos_para_posicoes(blocos[1], blocos[2])
+    indices_tipo = _ler_array('B', blocos[3])
+    estagios = _ler_array('B', blocos[4])
+    estragadas = _ler_array('B', blocos[5])
+    fatores = _ler_array('f', blocos[6])
+    decorridos = _ler_array('d', blocos[7])
+    
+    fazenda = {posicao_planta: Planta(tipos[indice], estagio, tempo_atual - decorrido, bool(estragada), fator)
+               for posicao_planta, indice, estagio, estragada, fator, decorrido
+               in zip(posicoes, indices_tipo, estagios, estragadas, fatores, decorridos)}
+    
+    resultado = {
+        'dinheiro': meta['dinheiro'],
+        'sementes': meta['sementes'],
+        'fazenda': fazenda,
+        'terra_adubada': _blocos_para_posicoes(blocos[8], blocos[9]),
+        'buracos_com_agua': _blocos_para_posicoes(blocos[10], blocos[11]),
+        'pocos': _blocos_para_posicoes(blocos[12], blocos[13]),
+        'terra_aguada': [],
+        'trabalhadores': trabalhadores_no_relogio(meta.get('trabalhadores', []), tempo_atual),
+        'data_save': meta.get('data_save', 'Desconhecida'),
+        'tempo': tempo_atual,
+        'geracao': geracao
+    }
+    if len(blocos) > 14:
+        resultado['posicoes'] = _blocos_para_posicoes(blocos[14], blocos[15])
+    return resultado
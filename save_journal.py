@@ -0,0 +1,154 @@
+"""
+Diário de alterações dos saves.
+
+Em vez de regravar o mundo inteiro a cada save, o SaveSystem anexa ao diário só
+os tiles alterados desde o save anterior; de tempos em tempos o diário é
+consolidado num save completo novo.
+
+Layout (little-endian):
+    cabeçalho: MAGICO (4 bytes) | versão (uint16) | reservado (uint16) | geração do save base (uint64)
+    entradas: tamanho (uint32) | crc32 (uint32) | bytes no formato de save_format,
+              com o bloco extra de posições alteradas
+O diário só vale para o save base com a mesma geração. Os tempos das entradas
+estão no relógio da sessão que gravou o save base, então base e entradas podem
+ser combinados diretamente. Uma entrada incompleta ou corrompida no fim (ex:
+jogo fechado no meio da gravação) encerra a leitura.
+"""
+import os
+import random
+import struct
+import zlib
+import save_format
+
+MAGICO = b'MRDI'
+VERSAO = 1
+CABECALHO = struct.Struct('<4sHHQ')
+CABECALHO_ENTRADA = struct.Struct('<II')
+
+
+def nova_geracao():
+    """Identificador que liga um save base ao seu diário"""
+    return random.getrandbits(63)
+
+
+def codificar_cabecalho(geracao):
+    return CABECALHO.pack(MAGICO, VERSAO, 0, geracao)
+
+
+def codificar_entrada(snapshot, compressao=save_format.COMPRESSAO_PADRAO):
+    """Entrada do diário a partir de um snapshot parcial (com a lista 'posicoes' alteradas)"""
+    dados = save_format.codificar(snapshot, compressao)
+    return CABECALHO_ENTRADA.pack(len(dados), zlib.crc32(dados)) + dados
+
+
+def ler(dados):
+    """Retorna (geração, [bytes de cada entrada íntegra]), ou (None, []) se o diário for inválido"""
+    if len(dados) < CABECALHO.size:
+        return None, []
+    magico, versao, _, geracao = CABECALHO.unpack_from(dados)
+    if magico != MAGICO or versao > VERSAO:
+        return None, []
+    
+    entradas = []
+    posicao = CABECALHO.size
+    while posicao + CABECALHO_ENTRADA.size <= len(dados):
+        tamanho, crc = CABECALHO_ENTRADA.unpack_from(dados, posicao)
+        inicio = posicao + CABECALHO_ENTRADA.size
+        entrada = dados[inicio:inicio + tamanho]
+        if len(entrada) < tamanho or zlib.crc32(entrada) != crc:
+            break
+        entradas.append(entrada)
+        posicao = inicio + tamanho
+    return geracao, entradas
+
+
+def ler_ultimo_resumo(arquivo, geracao):
+    """
+    Resumo (save_format.ler_resumo) da última entrada do diário aberto em `arquivo`,
+    lendo só os cabeçalhos das entradas. Retorna None se o diário não pertence ao
+    save base da geração informada ou não tem entradas completas.
+    O CRC não é conferido aqui: isso fica para o carregamento.
+    """
+    cabecalho = arquivo.read(CABECALHO.size)
+    if len(cabecalho) < CABECALHO.size:
+        return None
+    magico, versao, _, geracao_diario = CABECALHO.unpack(cabecalho)
+    if magico != MAGICO or versao > VERSAO or geracao_diario != geracao:
+        return None
+    
+    tamanho_arquivo = os.fstat(arquivo.fileno()).st_size
+    ultima = None
+    posicao = CABECALHO.size
+    while posicao + CABECALHO_ENTRADA.size <= tamanho_arquivo:
+        arquivo.seek(posicao)
+        tamanho, _ = CABECALHO_ENTRADA.unpack(arquivo.read(CABECALHO_ENTRADA.size))
+        inicio = posicao + CABECALHO_ENTRADA.size
+        if inicio + tamanho > tamanho_arquivo:
+            break
+        ultima = inicio
+        posicao = inicio + tamanho
+    
+    if ultima is None:
+        return None
+    arquivo.seek(ultima)
+    return save_format.ler_resumo(arquivo.read(save_format.TAMANHO_INICIO))
+
+
+def aplicar(estado, entrada):
+    """Aplica uma entrada decodificada sobre o estado (terra_adubada e buracos como sets)"""
+    fazenda = estado['fazenda']
+    terra_adubada = estado['terra_adubada']
+    buracos = estado['buracos_com_agua']
+    for posicao in entrada['posicoes']:
+        fazenda.pop(posicao, None)
+        terra_adubada.discard(posicao)
+        buracos.discard(posicao)
+    
+    fazenda.update(entrada['fazenda'])
+    terra_adubada.update(entrada['terra_adubada'])
+    buracos.update(entrada['buracos_com_agua'])
+    for chave in ('dinheiro', 'sementes', 'pocos', 'trabalhadores', 'data_save', 'tempo'):
+        estado[chave] = entrada[chave]
+
+
+def reconstruir(dados_base, dados_diario):
+    """
+    Decodifica o save base e aplica as entradas do diário que pertencem a ele.
+    Os tempos de plantio ficam no relógio da sessão que gravou; 'tempo' é o da última entrada.
+    Retorna (estado, quantidade de entradas aplicadas).
+    """
+    estado = save_format.decodificar(dados_base)
+    geracao, entradas = ler(dados_diario) if dados_diario else (None, [])
+    if geracao is None or geracao != estado.get('geracao') or not entradas:
+        return estado, 0
+    
+    estado['terra_adubada'] = set(estado['terra_adubada'])
+    estado['buracos_com_agua'] = set(estado['buracos_com_agua'])
+    for entrada in entradas:
+        aplicar(estado, save_format.decodificar(entrada))
+    estado['terra_adubada'] = list(estado['terra_adubada'])
+    estado['buracos_com_agua'] = list(estado['buracos_com_agua'])
+    return estado, len(entradas)
+
+
+def para_snapshot(estado, geracao):
+    """Converte um estado reconstruído no snapshot aceito por save_format.codificar"""
+    return {
+        'dinheiro': estado['dinheiro'],
+        'sementes': estado['sementes'],
+        'farm': {
+            'tempo': estado['tempo'],
+            'plantas': [(posicao, planta.tipo, planta.estagio, planta.tempo_plantio,
+                         planta.estragada, planta.fator_crescimento)
+                        for posicao, planta in estado['fazenda'].items()],
+            'terra_adubada': estado['terra_adubada']
+        },
+        'water': {
+            'buracos_com_agua': estado['buracos_com_agua'],
+            'pocos': estado['pocos']
+        },
+        'trabalhadores': save_format.trabalhadores_para_save(estado['trabalhadores'], estado['tempo']),
+        'data_save': estado['data_save'],
+        'total_plantas': len(estado['fazenda']),
+        'geracao': geracao
+    }
@@ -1,104 +1,503 @@
 import json
 import os
+import queue
+import tempfile
+import threading
 import time
+import weakref
 from datetime import datetime
+import save_format
+import save_journal
+from plant import Planta, TipoSemente
 
 class SaveSystem:
-    SAVE_FILE = "fazenda_save.json"
+    # Cada slot é um arquivo PASTA_SAVES/<slot>.sav; o índice guarda o resumo de cada um para o menu
+    PASTA_SAVES = "saves"
+    ARQUIVO_INDICE = "indice.json"
+    NUM_SLOTS = 3
+    slot_atual = "1"
+    # Save único de antes dos slots (binário ou JSON), movido para um slot livre na primeira listagem
+    SAVE_FILE = "fazenda_save.sav"
+    SAVE_FILE_JSON = "fazenda_save.json"
+    COMPRESSAO = save_format.COMPRESSAO_PADRAO
+    
+    # Diário: saves seguidos do mesmo jogo só anexam os tiles alterados a <save>.diario,
+    # que é consolidado num save completo ao passar destes limites
+    DIARIO = True
+    MAX_ENTRADAS_DIARIO = 50
+    PROPORCAO_MAXIMA_DIARIO = 0.5  # Tamanho do diário em relação ao save base
+    _diario = None  # (weakref do WorldStore, caminho) do jogo cujas mudanças estão sendo acompanhadas
+    _diario_com_falha = False
+    _entradas_diario = 0
+    _trava_escrita = threading.Lock()
+    
+    # Gravação em segundo plano: uma thread consome a fila de snapshots e publica os resultados
+    _fila_salvamentos = queue.Queue()
+    _resultados_salvamento = queue.Queue()
+    _thread_salvamento = None
+    _trava_thread = threading.Lock()
+    
+    @staticmethod
+    def criar_snapshot(player, farm_system, water_system, worker_system, posicoes=None):
+        """
+        Copia o estado do jogo para estruturas independentes das usadas pela simulação.
+        Roda na thread do jogo e só faz cópias rasas; a formatação e a escrita ficam
+        para escrever_snapshot, que pode rodar em outra thread.
+        Com posicoes, só esses tiles entram no snapshot (entrada do diário).
+        """
+        snapshot = {
+            'dinheiro': player.dinheiro,
+            'sementes': dict(player.sementes),
+            'farm': farm_system.obter_snapshot(posicoes),
+            'water': water_system.obter_snapshot(posicoes),
+            'total_plantas': len(farm_system.fazenda),
+            'trabalhadores': worker_system.obter_dados_save(),
+            'data_save': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if posicoes is not None:
+            snapshot['posicoes'] = posicoes
+        return snapshot
+    
+    @staticmethod
+    def _preparar_snapshot(player, farm_system, water_system, worker_system, caminho=None, completo=False):
+        """
+        Decide entre save completo e entrada do diário e tira o snapshot correspondente.
+        O diário só continua o save completo feito por este mesmo jogo nesta sessão,
+        já que os tempos das entradas usam o relógio da sessão.
+        """
+        caminho = caminho or SaveSystem.caminho_slot()
+        mundo = farm_system.mundo
+        diario = SaveSystem._diario
+        if (SaveSystem.DIARIO and not completo and not SaveSystem._diario_com_falha and
+                diario is not None and diario[0]() is mundo and diario[1] == caminho and
+                mundo.alteracoes is not None):
+            posicoes = list(mundo.alteracoes)
+            mundo.alteracoes = set()
+            return caminho, SaveSystem.criar_snapshot(player, farm_system, water_system, worker_system, posicoes)
+        
+        snapshot = SaveSystem.criar_snapshot(player, farm_system, water_system, worker_system)
+        if SaveSystem.DIARIO:
+            mundo.alteracoes = set()
+            SaveSystem._diario = (weakref.ref(mundo), caminho)
+        else:
+            mundo.alteracoes = None
+            SaveSystem._diario = None
+        return caminho, snapshot
+    
+    @staticmethod
+    def usar_slot(slot):
+        """Define o slot usado pelos saves e carregamentos sem caminho explícito"""
+        SaveSystem.slot_atual = str(slot)
+    
+    @staticmethod
+    def caminho_slot(slot=None, extensao=".sav"):
+        return os.path.join(SaveSystem.PASTA_SAVES, str(slot or SaveSystem.slot_atual) + extensao)
     
     @staticmethod
-    def save_game(player, farm_system, water_system, worker_system):
+    def caminho_diario(caminho=None):
+        return (caminho or SaveSystem.caminho_slot()) + ".diario"
+    
+    @staticmethod
+    def _gravar_arquivo(caminho, dados, sincronizar=True):
+        """Grava num arquivo temporário e só então substitui o original, para nunca deixá-lo pela metade"""
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+        descritor, caminho_temp = tempfile.mkstemp(dir=pasta, prefix=os.path.basename(caminho) + '.', suffix='.tmp')
         try:
-            dados_farm = farm_system.obter_dados_save()
-            dados_water = water_system.obter_dados_save()
-            dados_workers = worker_system.obter_dados_save()
-            
-            dados_save = {
-                'dinheiro': player.dinheiro,
-                'sementes': player.sementes,
-                'fazenda': dados_farm['fazenda'],
-                'terra_adubada': dados_farm['terra_adubada'],
-                'buracos_com_agua': dados_water['buracos_com_agua'],
-                'terra_aguada': dados_water['terra_aguada'],
-                'trabalhadores': dados_workers,
-                'data_save': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            with open(SaveSystem.SAVE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(dados_save, f, indent=4, ensure_ascii=False)
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(dados)
+                f.flush()
+                if sincronizar:
+                    os.fsync(f.fileno())
+            os.replace(caminho_temp, caminho)
+        except Exception:
+            if os.path.exists(caminho_temp):
+                os.remove(caminho_temp)
+            raise
+    
+    @staticmethod
+    def escrever_snapshot(snapshot, caminho=None, compressao=None):
+        """Grava um snapshot completo (novo save base) ou anexa ao diário um snapshot parcial"""
+        caminho = caminho or SaveSystem.caminho_slot()
+        compressao = compressao or SaveSystem.COMPRESSAO
+        with SaveSystem._trava_escrita:
+            try:
+                if 'posicoes' in snapshot:
+                    SaveSystem._anexar_diario(snapshot, caminho, compressao)
+                else:
+                    SaveSystem._escrever_completo(snapshot, caminho, compressao)
+            except Exception as e:
+                print(f"Erro ao salvar jogo: {e}")
+                # O diário pode ter ficado sem alguma mudança: o próximo save precisa ser completo
+                SaveSystem._diario_com_falha = True
+                return False
             
+            slot = SaveSystem._slot_do_caminho(caminho)
+            if slot is not None:
+                SaveSystem._atualizar_indice(slot, {
+                    'dinheiro': snapshot['dinheiro'],
+                    'data_save': snapshot['data_save'],
+                    'total_plantas': snapshot['total_plantas'],
+                    'total_trabalhadores': len(snapshot['trabalhadores'])
+                })
             return True
+    
+    @staticmethod
+    def _escrever_completo(snapshot, caminho, compressao):
+        diario = SaveSystem.caminho_diario(caminho)
+        if SaveSystem.DIARIO:
+            geracao = save_journal.nova_geracao()
+            SaveSystem._gravar_arquivo(caminho, save_format.codificar(dict(snapshot, geracao=geracao), compressao))
+            SaveSystem._gravar_arquivo(diario, save_journal.codificar_cabecalho(geracao))
+        else:
+            SaveSystem._gravar_arquivo(caminho, save_format.codificar(snapshot, compressao))
+            if os.path.exists(diario):
+                os.remove(diario)
+        SaveSystem._entradas_diario = 0
+        SaveSystem._diario_com_falha = False
+    
+    @staticmethod
+    def _anexar_diario(snapshot, caminho, compressao):
+        if SaveSystem._diario_com_falha:
+            raise RuntimeError("diário desatualizado, o próximo save será completo")
+        diario = SaveSystem.caminho_diario(caminho)
+        if not os.path.exists(diario):
+            raise FileNotFoundError(diario)
+        
+        with open(diario, 'ab') as f:
+            f.write(save_journal.codificar_entrada(snapshot, compressao))
+            f.flush()
+            os.fsync(f.fileno())
+        SaveSystem._entradas_diario += 1
+        
+        if (SaveSystem._entradas_diario >= SaveSystem.MAX_ENTRADAS_DIARIO or
+                os.path.getsize(diario) > os.path.getsize(caminho) * SaveSystem.PROPORCAO_MAXIMA_DIARIO):
+            SaveSystem._consolidar_diario(caminho, compressao)
+    
+    @staticmethod
+    def _consolidar_diario(caminho, compressao):
+        """Aplica o diário sobre o save base e grava o resultado como um novo save base"""
+        diario = SaveSystem.caminho_diario(caminho)
+        with open(caminho, 'rb') as f:
+            dados_base = f.read()
+        with open(diario, 'rb') as f:
+            dados_diario = f.read()
+        
+        estado, aplicadas = save_journal.reconstruir(dados_base, dados_diario)
+        if aplicadas:
+            geracao = save_journal.nova_geracao()
+            SaveSystem._gravar_arquivo(caminho, save_format.codificar(save_journal.para_snapshot(estado, geracao), compressao))
+            SaveSystem._gravar_arquivo(diario, save_journal.codificar_cabecalho(geracao))
+        SaveSystem._entradas_diario = 0
+    
+    @staticmethod
+    def save_game(player, farm_system, water_system, worker_system, caminho=None, completo=False):
+        """
+        Salva imediatamente, bloqueando até o arquivo estar gravado.
+        completo=True força um save base novo em vez de uma entrada no diário.
+        """
+        try:
+            caminho, snapshot = SaveSystem._preparar_snapshot(
+                player, farm_system, water_system, worker_system, caminho, completo)
+        except Exception as e:
+            print(f"Erro ao salvar jogo: {e}")
+            return False
+        return SaveSystem.escrever_snapshot(snapshot, caminho)
+    
+    @staticmethod
+    def save_game_async(player, farm_system, water_system, worker_system, caminho=None):
+        """
+        Tira o snapshot agora e deixa a gravação para a thread de salvamento.
+        O resultado fica disponível em obter_resultado_salvamento().
+        """
+        try:
+            caminho, snapshot = SaveSystem._preparar_snapshot(player, farm_system, water_system, worker_system, caminho)
         except Exception as e:
             print(f"Erro ao salvar jogo: {e}")
+            SaveSystem._resultados_salvamento.put(False)
             return False
+        
+        with SaveSystem._trava_thread:
+            if SaveSystem._thread_salvamento is None or not SaveSystem._thread_salvamento.is_alive():
+                SaveSystem._thread_salvamento = threading.Thread(
+                    target=SaveSystem._processar_salvamentos, name="salvamento", daemon=True)
+                SaveSystem._thread_salvamento.start()
+        SaveSystem._fila_salvamentos.put((snapshot, caminho))
+        return True
+    
+    @staticmethod
+    def _processar_salvamentos():
+        while True:
+            snapshot, caminho = SaveSystem._fila_salvamentos.get()
+            try:
+                SaveSystem._resultados_salvamento.put(SaveSystem.escrever_snapshot(snapshot, caminho))
+            finally:
+                SaveSystem._fila_salvamentos.task_done()
+    
+    @staticmethod
+    def obter_resultado_salvamento():
+        """Retorna True/False para cada save em segundo plano concluído, ou None se não há novidade"""
+        try:
+            return SaveSystem._resultados_salvamento.get_nowait()
+        except queue.Empty:
+            return None
+    
+    @staticmethod
+    def aguardar_salvamentos():
+        """Bloqueia até todos os saves em segundo plano terminarem (ex: antes de fechar o jogo)"""
+        SaveSystem._fila_salvamentos.join()
+    
+    @staticmethod
+    def _caminho_save(slot=None):
+        """Save do slot, ou o save JSON antigo do slot se ainda não houver um no formato binário"""
+        for extensao in (".sav", ".json"):
+            caminho = SaveSystem.caminho_slot(slot, extensao)
+            if os.path.exists(caminho):
+                return caminho
+        return None
+    
+    @staticmethod
+    def _slot_do_caminho(caminho):
+        """Nome do slot se o caminho é um save dentro de PASTA_SAVES, senão None"""
+        pasta, nome = os.path.split(os.path.abspath(caminho))
+        if pasta != os.path.abspath(SaveSystem.PASTA_SAVES) or nome == SaveSystem.ARQUIVO_INDICE:
+            return None
+        slot, extensao = os.path.splitext(nome)
+        return slot if extensao in (".sav", ".json") else None
     
     @staticmethod
-    def load_game():
+    def load_game(relogio=None, caminho=None):
+        caminho = caminho or SaveSystem._caminho_save()
         try:
-            if not os.path.exists(SaveSystem.SAVE_FILE):
+            if caminho is None or not os.path.exists(caminho):
                 return None
             
-            with open(SaveSystem.SAVE_FILE, 'r', encoding='utf-8') as f:
-                dados_save = json.load(f)
+            diario = SaveSystem.caminho_diario(caminho)
+            dados_diario = None
+            # A trava evita ler o save base e o diário no meio de uma consolidação
+            with SaveSystem._trava_escrita:
+                with open(caminho, 'rb') as f:
+                    dados = f.read()
+                if os.path.exists(diario):
+                    with open(diario, 'rb') as f:
+                        dados_diario = f.read()
             
-            tempo_atual = time.time()
-            fazenda = {}
-            for key, planta in dados_save['fazenda'].items():
-                pos_x, pos_y = map(int, key.split(','))
-                
-                if 'tempo_decorrido' in planta:
-                    tempo_plantio = tempo_atual - planta['tempo_decorrido']
-                else:
-                    tempo_plantio = planta.get('tempo_plantio', tempo_atual)
-                
-                fazenda[(pos_x, pos_y)] = {
-                    'tipo': planta['tipo'],
-                    'estagio': planta['estagio'],
-                    'tempo_plantio': tempo_plantio,
-                    'estragada': planta.get('estragada', False),
-                    'fator_crescimento': planta.get('fator_crescimento', 1.0)
-                }
-            
-            return {
-                'dinheiro': dados_save['dinheiro'],
-                'sementes': dados_save['sementes'],
-                'fazenda': fazenda,
-                'terra_adubada': dados_save.get('terra_adubada', []),
-                'buracos_com_agua': dados_save.get('buracos_com_agua', []),
-                'terra_aguada': dados_save.get('terra_aguada', []),
-                'trabalhadores': dados_save.get('trabalhadores', []),
-                'data_save': dados_save.get('data_save', 'Desconhecida')
-            }
+            tempo_atual = relogio.agora() if relogio is not None else time.time()
+            if save_format.eh_binario(dados):
+                if dados_diario is None:
+                    return save_format.decodificar(dados, tempo_atual)
+                return SaveSystem._carregar_com_diario(dados, dados_diario, tempo_atual)
+            return SaveSystem._carregar_json(json.loads(dados.decode('utf-8')), tempo_atual)
         except Exception as e:
             print(f"Erro ao carregar jogo: {e}")
             return None
     
     @staticmethod
-    def save_exists():
-        return os.path.exists(SaveSystem.SAVE_FILE)
+    def _carregar_com_diario(dados, dados_diario, tempo_atual):
+        estado, _ = save_journal.reconstruir(dados, dados_diario)
+        # Do relógio da sessão que gravou para o relógio atual, como nos saves completos
+        deslocamento = tempo_atual - estado['tempo']
+        for planta in estado['fazenda'].values():
+            planta.tempo_plantio += deslocamento
+        for trabalhador in estado['trabalhadores']:
+            trabalhador['ultimo_pagamento'] += deslocamento
+        estado['tempo'] = tempo_atual
+        return estado
+    
+    @staticmethod
+    def _carregar_json(dados_save, tempo_atual):
+        fazenda = {}
+        for key, planta in dados_save['fazenda'].items():
+            pos_x, pos_y = map(int, key.split(','))
+            
+            if 'tempo_decorrido' in planta:
+                tempo_plantio = tempo_atual - planta['tempo_decorrido']
+            else:
+                tempo_plantio = planta.get('tempo_plantio', tempo_atual)
+            
+            fazenda[(pos_x, pos_y)] = Planta(TipoSemente(planta['tipo']), planta['estagio'], tempo_plantio,
+                                             planta.get('estragada', False),
+                                             planta.get('fator_crescimento', 1.0))
+        
+        return {
+            'dinheiro': dados_save['dinheiro'],
+            'sementes': dados_save['sementes'],
+            'fazenda': fazenda,
+            'terra_adubada': dados_save.get('terra_adubada', []),
+            'buracos_com_agua': dados_save.get('buracos_com_agua', []),
+            'pocos': dados_save.get('pocos'),
+            'terra_aguada': dados_save.get('terra_aguada', []),
+            'trabalhadores': save_format.trabalhadores_no_relogio(dados_save.get('trabalhadores', []), tempo_atual),
+            'data_save': dados_save.get('data_save', 'Desconhecida')
+        }
+    
+    @staticmethod
+    def save_exists(slot=None):
+        return SaveSystem._caminho_save(slot) is not None
     
     @staticmethod
-    def get_save_info():
+    def get_save_info(caminho=None):
+        """
+        Dinheiro, data, plantas e trabalhadores do save, para o menu.
+        Saves binários guardam isso num resumo no início do arquivo (e em cada entrada
+        do diário), então só alguns bytes são lidos; saves antigos são carregados inteiros.
+        """
+        caminho = caminho or SaveSystem._caminho_save()
         try:
-            if not SaveSystem.save_exists():
+            if caminho is None or not os.path.exists(caminho):
                 return None
             
-            with open(SaveSystem.SAVE_FILE, 'r', encoding='utf-8') as f:
-                dados_save = json.load(f)
+            with SaveSystem._trava_escrita:
+                with open(caminho, 'rb') as f:
+                    resumo = save_format.ler_resumo(f.read(save_format.TAMANHO_INICIO))
+                diario = SaveSystem.caminho_diario(caminho)
+                if resumo is not None and resumo['geracao'] is not None and os.path.exists(diario):
+                    with open(diario, 'rb') as f:
+                        resumo = save_journal.ler_ultimo_resumo(f, resumo['geracao']) or resumo
+            
+            if resumo is not None:
+                return {
+                    'dinheiro': resumo['dinheiro'],
+                    'data_save': resumo['data_save'],
+                    'total_plantas': resumo['total_plantas'],
+                    'total_trabalhadores': resumo['total_trabalhadores']
+                }
+            
+            dados_save = SaveSystem.load_game(caminho=caminho)
+            if dados_save is None:
+                return None
             
             return {
                 'dinheiro': dados_save['dinheiro'],
                 'data_save': dados_save.get('data_save', 'Desconhecida'),
-                'total_plantas': len(dados_save.get('fazenda', {}))
+                'total_plantas': len(dados_save.get('fazenda', {})),
+                'total_trabalhadores': len(dados_save.get('trabalhadores', []))
             }
         except:
             return None
     
     @staticmethod
-    def delete_save():
+    def delete_save(slot=None):
+        """Remove só os arquivos do slot (save, diário e JSON antigo) e a sua entrada no índice"""
+        slot = str(slot or SaveSystem.slot_atual)
         try:
-            if os.path.exists(SaveSystem.SAVE_FILE):
-                os.remove(SaveSystem.SAVE_FILE)
+            caminho = SaveSystem.caminho_slot(slot)
+            with SaveSystem._trava_escrita:
+                for arquivo in (caminho, SaveSystem.caminho_diario(caminho), SaveSystem.caminho_slot(slot, ".json")):
+                    if os.path.exists(arquivo):
+                        os.remove(arquivo)
+                SaveSystem._atualizar_indice(slot, None)
+            if SaveSystem._diario is not None and SaveSystem._diario[1] == caminho:
+                SaveSystem._diario = None
             return True
         except:
             return False
+    
+    @staticmethod
+    def _caminho_indice():
+        return os.path.join(SaveSystem.PASTA_SAVES, SaveSystem.ARQUIVO_INDICE)
+    
+    @staticmethod
+    def _ler_indice():
+        try:
+            with open(SaveSystem._caminho_indice(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _gravar_indice(indice):
+        # O índice é só um cache: sem fsync, e se ficar desatualizado é refeito na listagem
+        dados = json.dumps(indice, ensure_ascii=False, indent=2).encode('utf-8')
+        SaveSystem._gravar_arquivo(SaveSystem._caminho_indice(), dados, sincronizar=False)
+    
+    @staticmethod
+    def _assinatura(slot):
+        """(tamanho, data de modificação) dos arquivos do slot, para saber se a entrada do índice ainda vale"""
+        tamanho = 0
+        modificado = 0
+        caminho = SaveSystem._caminho_save(slot)
+        for arquivo in (caminho, SaveSystem.caminho_diario(caminho)):
+            try:
+                estado = os.stat(arquivo)
+            except OSError:
+                continue
+            tamanho += estado.st_size
+            modificado = max(modificado, estado.st_mtime_ns)
+        return [tamanho, modificado]
+    
+    @staticmethod
+    def _atualizar_indice(slot, info):
+        """Grava (ou remove, com info=None) a entrada do slot no índice; chamado com _trava_escrita"""
+        try:
+            indice = SaveSystem._ler_indice()
+            if info is None:
+                if indice.pop(slot, None) is None:
+                    return
+            else:
+                assinatura = SaveSystem._assinatura(slot)
+                indice[slot] = dict(info, tamanho=assinatura[0], assinatura=assinatura)
+            SaveSystem._gravar_indice(indice)
+        except Exception as e:
+            print(f"Erro ao atualizar o índice de saves: {e}")
+    
+    @staticmethod
+    def listar_slots():
+        """
+        Retorna {slot: info} dos slots com save, com dinheiro, data_save, total_plantas,
+        total_trabalhadores e tamanho (bytes). Vem do índice: os saves só são abertos
+        (e apenas o resumo do início) quando o tamanho ou a data do arquivo não batem.
+        """
+        SaveSystem._migrar_save_antigo()
+        if not os.path.isdir(SaveSystem.PASTA_SAVES):
+            return {}
+        
+        with SaveSystem._trava_escrita:
+            indice = SaveSystem._ler_indice()
+            slots = {}
+            for nome in sorted(os.listdir(SaveSystem.PASTA_SAVES)):
+                slot = SaveSystem._slot_do_caminho(os.path.join(SaveSystem.PASTA_SAVES, nome))
+                if slot is None or slot in slots:
+                    continue
+                assinatura = SaveSystem._assinatura(slot)
+                item = indice.get(slot)
+                if item is None or item.get('assinatura') != assinatura:
+                    item = None
+                slots[slot] = item
+        
+        # get_save_info usa a trava, então as entradas desatualizadas são refeitas fora dela
+        alterado = set(indice) != set(slots)
+        for slot, item in slots.items():
+            if item is None:
+                info = SaveSystem.get_save_info(SaveSystem._caminho_save(slot))
+                assinatura = SaveSystem._assinatura(slot)
+                slots[slot] = dict(info or {}, tamanho=assinatura[0], assinatura=assinatura)
+                alterado = True
+        
+        if alterado:
+            with SaveSystem._trava_escrita:
+                try:
+                    SaveSystem._gravar_indice(slots)
+                except Exception as e:
+                    print(f"Erro ao atualizar o índice de saves: {e}")
+        return {slot: item for slot, item in slots.items() if 'dinheiro' in item}
+    
+    @staticmethod
+    def _migrar_save_antigo():
+        """Move o save único de antes dos slots (e seu diário) para o primeiro slot livre"""
+        antigos = [arquivo for arquivo in (SaveSystem.SAVE_FILE, SaveSystem.SAVE_FILE_JSON) if os.path.exists(arquivo)]
+        if not antigos:
+            return
+        livres = [str(numero) for numero in range(1, SaveSystem.NUM_SLOTS + 1) if not SaveSystem.save_exists(str(numero))]
+        slot = livres[0] if livres else "antigo"
+        try:
+            os.makedirs(SaveSystem.PASTA_SAVES, exist_ok=True)
+            with SaveSystem._trava_escrita:
+                for arquivo in antigos:
+                    destino = SaveSystem.caminho_slot(slot, os.path.splitext(arquivo)[1])
+                    os.replace(arquivo, destino)
+                    if os.path.exists(SaveSystem.caminho_diario(arquivo)):
+                        os.replace(SaveSystem.caminho_diario(arquivo), SaveSystem.caminho_diario(destino))
+            print(f"Save antigo movido para o slot {slot}")
+        except OSError as e:
+            print(f"Erro ao mover o save antigo: {e}")
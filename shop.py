@@ -1,6 +1,7 @@
 import pygame
 from config import TIPOS_SEMENTE, CORES
 from sound_system import SoundSystem
+from text_cache import renderizar_texto
 
 class Shop:
     def __init__(self, largura, altura):
@@ -11,7 +12,10 @@ class Shop:
         self.aba_atual = 'sementes'
         self.fonte_titulo = pygame.font.Font(None, 32)
         self.fonte = pygame.font.Font(None, 24)
+        self.fonte_pequena = pygame.font.Font(None, 20)
         self.sound_system = SoundSystem()
+        self._painel = None
+        self._chave_painel = None
     
     def toggle(self):
         self.aberta = not self.aberta
@@ -30,6 +34,7 @@ class Shop:
     def atualizar_dimensoes(self, largura, altura):
         self.largura = largura
         self.altura = altura
+        self._painel = None
     
     def navegar(self, direcao):
         if self.aba_atual == 'sementes':
@@ -78,14 +83,33 @@ class Shop:
             self.sound_system.tocar_sfx('select_erro')
             return False
     
-    def desenhar(self, tela, worker_system=None):
+    def obter_rect(self):
+        """Área da tela ocupada pelo painel da loja"""
         largura_loja = 450
         altura_loja = 500
-        x_loja = (self.largura - largura_loja) // 2
-        y_loja = (self.altura - altura_loja) // 2
+        return pygame.Rect((self.largura - largura_loja) // 2, (self.altura - altura_loja) // 2, largura_loja, altura_loja)
+    
+    def desenhar(self, tela, worker_system=None):
+        """Desenha a loja e retorna a área da tela ocupada por ela"""
+        contagens = None
+        if self.aba_atual == 'trabalhadores' and worker_system:
+            contagens = worker_system.contar_trabalhadores_por_tipo()
         
-        pygame.draw.rect(tela, CORES['loja_fundo'], (x_loja, y_loja, largura_loja, altura_loja))
-        pygame.draw.rect(tela, CORES['borda_interface'], (x_loja, y_loja, largura_loja, altura_loja), 3)
+        # O painel só é refeito quando a aba, a seleção ou as contagens exibidas mudam
+        chave = (self.aba_atual, self.item_selecionado, contagens)
+        if self._painel is None or chave != self._chave_painel:
+            self._painel = self._renderizar_painel(worker_system)
+            self._chave_painel = chave
+        
+        return tela.blit(self._painel, self.obter_rect().topleft)
+    
+    def _renderizar_painel(self, worker_system):
+        largura_loja, altura_loja = self.obter_rect().size
+        x_loja = y_loja = 0
+        painel = pygame.Surface((largura_loja, altura_loja))
+        
+        pygame.draw.rect(painel, CORES['loja_fundo'], (x_loja, y_loja, largura_loja, altura_loja))
+        pygame.draw.rect(painel, CORES['borda_interface'], (x_loja, y_loja, largura_loja, altura_loja), 3)
         
         titulo_map = {
             'sementes': 'SEMENTES',
@@ -93,21 +117,25 @@ class Shop:
             'utilidades': 'UTILIDADES'
         }
         titulo_texto = "LOJA - " + titulo_map.get(self.aba_atual, 'SEMENTES')
-        titulo = self.fonte_titulo.render(titulo_texto, True, CORES['texto'])
-        titulo_rect = titulo.get_rect(center=(self.largura // 2, y_loja + 30))
-        tela.blit(titulo, titulo_rect)
+        titulo = renderizar_texto(self.fonte_titulo, titulo_texto, True, CORES['texto'])
+        titulo_rect = titulo.get_rect(center=(largura_loja // 2, y_loja + 30))
+        painel.blit(titulo, titulo_rect)
         
-        self._desenhar_abas(tela, x_loja, y_loja, largura_loja)
+        self._desenhar_abas(painel, x_loja, y_loja, largura_loja)
         
         y_offset = y_loja + 110
         
         if self.aba_atual == 'sementes':
-            self._desenhar_sementes(tela, x_loja, y_loja, y_offset, largura_loja)
+            self._desenhar_sementes(painel, x_loja, y_loja, y_offset, largura_loja)
         elif self.aba_atual == 'trabalhadores':
-            self._desenhar_trabalhadores(tela, x_loja, y_loja, y_offset, largura_loja, worker_system)
+            self._desenhar_trabalhadores(painel, x_loja, y_loja, y_offset, largura_loja, worker_system)
         else:  # utilidades
-            self._desenhar_utilidades(tela, x_loja, y_loja, y_offset, largura_loja)
+            self._desenhar_utilidades(painel, x_loja, y_loja, y_offset, largura_loja)
         
+        if pygame.display.get_surface() is not None:
+            painel = painel.convert()
+        return painel
+    
     def _desenhar_abas(self, tela, x_loja, y_loja, largura_loja):
         aba_largura = largura_loja // 3
         
@@ -123,10 +151,9 @@ class Shop:
         pygame.draw.rect(tela, CORES['borda_interface'], (x_loja + aba_largura, y_loja + 60, aba_largura, 35), 2)
         pygame.draw.rect(tela, CORES['borda_interface'], (x_loja + aba_largura * 2, y_loja + 60, aba_largura, 35), 2)
         
-        fonte_pequena = pygame.font.Font(None, 20)
-        texto_sementes = fonte_pequena.render("Sementes", True, CORES['texto'])
-        texto_trabalhadores = fonte_pequena.render("Trabalhadores", True, CORES['texto'])
-        texto_utilidades = fonte_pequena.render("Utilidades", True, CORES['texto'])
+        texto_sementes = renderizar_texto(self.fonte_pequena, "Sementes", True, CORES['texto'])
+        texto_trabalhadores = renderizar_texto(self.fonte_pequena, "Trabalhadores", True, CORES['texto'])
+        texto_utilidades = renderizar_texto(self.fonte_pequena, "Utilidades", True, CORES['texto'])
         
         tela.blit(texto_sementes, (x_loja + aba_largura//2 - texto_sementes.get_width()//2, y_loja + 72))
         tela.blit(texto_trabalhadores, (x_loja + aba_largura + aba_largura//2 - texto_trabalhadores.get_width()//2, y_loja + 72))
@@ -143,11 +170,11 @@ class Shop:
             if i == self.item_selecionado:
                 pygame.draw.rect(tela, CORES['loja_destaque'], (x_loja + 10, y_offset - 5, largura_loja - 20, 30))
             
-            texto_item = self.fonte.render(f"{tipo.capitalize()}: ${preco} cada", True, cor)
+            texto_item = renderizar_texto(self.fonte, f"{tipo.capitalize()}: ${preco} cada", True, cor)
             tela.blit(texto_item, (x_loja + 20, y_offset))
             
             if i == self.item_selecionado:
-                seta = self.fonte.render("[<<]", True, CORES['texto'])
+                seta = renderizar_texto(self.fonte, "[<<]", True, CORES['texto'])
                 tela.blit(seta, (x_loja + largura_loja - 50, y_offset))
             
             y_offset += 35
@@ -169,7 +196,7 @@ class Shop:
             if instrucao == "":
                 y_offset += 10
             else:
-                texto = self.fonte.render(instrucao, True, CORES['cinza_info'])
+                texto = renderizar_texto(self.fonte, instrucao, True, CORES['cinza_info'])
                 tela.blit(texto, (x_loja + 20, y_offset))
                 y_offset += 20
     
@@ -186,16 +213,16 @@ class Shop:
             if i == self.item_selecionado:
                 pygame.draw.rect(tela, CORES['loja_destaque'], (x_loja + 10, y_offset - 5, largura_loja - 20, 55))
             
-            texto_item = self.fonte.render(f"{nome} - $300", True, cor)
+            texto_item = renderizar_texto(self.fonte, f"{nome} - $300", True, cor)
             tela.blit(texto_item, (x_loja + 20, y_offset))
             
             ativos = contagem_ativos.get(tipo, 0)
             total = contagem_total.get(tipo, 0)
-            texto_ativos = self.fonte.render(f"Trabalhando: {ativos}/{total} (${total}/20s)", True, CORES['cinza_info'])
+            texto_ativos = renderizar_texto(self.fonte, f"Trabalhando: {ativos}/{total} (${total}/20s)", True, CORES['cinza_info'])
             tela.blit(texto_ativos, (x_loja + 20, y_offset + 20))
             
             if i == self.item_selecionado:
-                seta = self.fonte.render("[<<]", True, CORES['texto'])
+                seta = renderizar_texto(self.fonte, "[<<]", True, CORES['texto'])
                 tela.blit(seta, (x_loja + largura_loja - 50, y_offset))
             
             y_offset += 60
@@ -216,7 +243,7 @@ class Shop:
             if instrucao == "":
                 y_offset += 8
             else:
-                texto = self.fonte.render(instrucao, True, CORES['cinza_info'])
+                texto = renderizar_texto(self.fonte, instrucao, True, CORES['cinza_info'])
                 tela.blit(texto, (x_loja + 20, y_offset))
                 y_offset += 18
     
@@ -225,14 +252,14 @@ class Shop:
         if self.item_selecionado == 0:
             pygame.draw.rect(tela, CORES['loja_destaque'], (x_loja + 10, y_offset - 5, largura_loja - 20, 55))
         
-        texto_item = self.fonte.render("Poço - $1000", True, (50, 150, 255))
+        texto_item = renderizar_texto(self.fonte, "Poço - $1000", True, (50, 150, 255))
         tela.blit(texto_item, (x_loja + 20, y_offset))
         
-        texto_descricao = self.fonte.render("Permite pegar água em qualquer lugar", True, CORES['cinza_info'])
+        texto_descricao = renderizar_texto(self.fonte, "Permite pegar água em qualquer lugar", True, CORES['cinza_info'])
         tela.blit(texto_descricao, (x_loja + 20, y_offset + 25))
         
         if self.item_selecionado == 0:
-            seta = self.fonte.render("[<<]", True, CORES['texto'])
+            seta = renderizar_texto(self.fonte, "[<<]", True, CORES['texto'])
             tela.blit(seta, (x_loja + largura_loja - 50, y_offset))
         
         y_offset += 80
@@ -252,6 +279,6 @@ class Shop:
             if instrucao == "":
                 y_offset += 8
             else:
-                texto = self.fonte.render(instrucao, True, CORES['cinza_info'])
+                texto = renderizar_texto(self.fonte, instrucao, True, CORES['cinza_info'])
                 tela.blit(texto, (x_loja + 20, y_offset))
                 y_offset += 18
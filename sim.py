@@ -0,0 +1,125 @@
+"""
+Simulação sem janela da fazenda.
+
+Roda FarmSystem, WaterSystem, WorkerSystem e Player sem display nem áudio,
+tão rápido quanto a CPU permitir, e mostra ticks por segundo e um resumo final.
+
+Uso:
+    python sim.py --ticks 10000 --cenario saves/1.sav
+"""
+import os
+
+# Precisa vir antes de qualquer import do pygame (config chama pygame.init())
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from main import carregar_jogo, atualizar_simulacao
+from save_system import SaveSystem
+from player import Player
+from farm_system import FarmSystem
+from water_system import WaterSystem
+from worker_system import WorkerSystem
+from world_store import WorldStore
+from sim_clock import SimClock
+
+
+def criar_mundo(relogio=None):
+    """Cria os sistemas da simulação compartilhando o mesmo mundo e relógio"""
+    relogio = relogio if relogio is not None else SimClock()
+    mundo = WorldStore()
+    player = Player(x=100, y=100)
+    farm_system = FarmSystem(mundo, relogio)
+    water_system = WaterSystem(mundo)
+    worker_system = WorkerSystem(relogio)
+    return relogio, player, farm_system, water_system, worker_system
+
+
+def cenario_padrao(player, water_system, worker_system):
+    """Fazenda pequena usada quando nenhum cenário é informado"""
+    player.dinheiro = 10000
+    player.sementes = {'milho': 500, 'tomate': 500, 'alface': 500}
+    for buraco in [(3, 3), (12, 3), (3, 12), (12, 12)]:
+        water_system.tem_balde_agua = True
+        water_system.encher_buraco_com_agua(buraco[0], buraco[1], {}, player)
+    for tipo in ['adubador', 'cultivador', 'coletador']:
+        for _ in range(2):
+            worker_system.contratar_trabalhador(tipo, player, (300, 300))
+
+
+def resumir(player, farm_system, water_system, worker_system):
+    estagios = {}
+    for planta in farm_system.fazenda.values():
+        estagios[planta.estagio] = estagios.get(planta.estagio, 0) + 1
+    contagem_ativos, contagem_total = worker_system.contar_trabalhadores_por_tipo()
+    return {
+        'dinheiro': player.dinheiro,
+        'sementes': dict(player.sementes),
+        'plantas': len(farm_system.fazenda),
+        'plantas_por_estagio': dict(sorted(estagios.items())),
+        'terra_adubada': len(farm_system.terra_adubada),
+        'terra_aguada': len(water_system.terra_aguada),
+        'buracos_com_agua': len(water_system.buracos_com_agua),
+        'trabalhadores_ativos': sum(contagem_ativos.values()),
+        'trabalhadores_total': sum(contagem_total.values()),
+        'tarefas_reservadas': len(worker_system.worker_consciousness.tarefas_alocadas)
+    }
+
+
+def simular(ticks, relogio, player, farm_system, water_system, worker_system):
+    """Executa ticks passos fixos e retorna o tempo real gasto"""
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        relogio.avancar(relogio.passo)
+        atualizar_simulacao(farm_system, water_system, worker_system, player)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação sem janela do Mundo da Roça")
+    parser.add_argument('--ticks', type=int, default=3600, help="Quantidade de passos fixos a simular")
+    parser.add_argument('--cenario', '--scenario', dest='cenario', help="Arquivo de save usado como estado inicial")
+    parser.add_argument('--seed', type=int, help="Semente do gerador aleatório")
+    parser.add_argument('--salvar', help="Salva o estado final neste arquivo")
+    parser.add_argument('--offline', type=float,
+                        help="Avança o cenário carregado por estes segundos de progresso offline antes de simular")
+    parser.add_argument('--verbose', action='store_true', help="Mostra as mensagens dos sistemas durante a simulação")
+    args = parser.parse_args()
+    
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    relogio, player, farm_system, water_system, worker_system = criar_mundo()
+    
+    saida = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with saida:
+        if args.cenario:
+            carregado = carregar_jogo(player, farm_system, water_system, worker_system, relogio, args.cenario,
+                                      args.offline)
+        else:
+            cenario_padrao(player, water_system, worker_system)
+            carregado = True
+    if not carregado:
+        parser.error(f"não foi possível carregar o cenário '{args.cenario}'")
+    
+    with saida:
+        duracao = simular(args.ticks, relogio, player, farm_system, water_system, worker_system)
+    
+    ticks_por_segundo = args.ticks / duracao if duracao > 0 else float('inf')
+    print(f"Ticks: {args.ticks} ({args.ticks * relogio.passo:.1f}s simulados) em {duracao:.3f}s reais")
+    print(f"Ticks por segundo: {ticks_por_segundo:.1f}")
+    for chave, valor in resumir(player, farm_system, water_system, worker_system).items():
+        print(f"  {chave}: {valor}")
+    
+    if args.salvar:
+        if SaveSystem.save_game(player, farm_system, water_system, worker_system, args.salvar):
+            print(f"Estado final salvo em {args.salvar}")
+
+
+if __name__ == "__main__":
+    main()
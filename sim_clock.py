@@ -0,0 +1,62 @@
+import time
+from config import FPS
+
+PASSO_SIMULACAO = 1 / FPS  # Duração fixa (em segundos de simulação) de cada passo
+MAX_PASSOS_POR_QUADRO = 200  # Acima disso o atraso é descartado em vez de acumulado
+
+class SimClock:
+    """
+    Relógio da simulação compartilhado por todos os sistemas.
+    A lógica do jogo lê o tempo daqui em vez de chamar time.time(), o que permite
+    acelerar (escala), pausar e avançar a simulação de forma determinística.
+    O tempo começa no horário atual para continuar compatível com os saves.
+    """
+    
+    def __init__(self, inicio=None, escala=1.0, passo=PASSO_SIMULACAO):
+        self.tempo = time.time() if inicio is None else inicio
+        self.escala = escala
+        self.passo = passo
+        self.pausado = False
+        self.max_passos = MAX_PASSOS_POR_QUADRO
+        self.tempo_real = time.monotonic()  # Lido uma vez por quadro, para a interface
+        self._acumulado = 0.0
+    
+    def agora(self):
+        """Tempo atual da simulação"""
+        return self.tempo
+    
+    def definir_escala(self, escala):
+        self.escala = max(0.0, escala)
+    
+    def pausar(self):
+        self.pausado = True
+    
+    def retomar(self):
+        self.pausado = False
+        self._acumulado = 0.0
+    
+    def avancar(self, segundos):
+        """Avança o relógio diretamente (uso em simulação sem janela e testes)"""
+        self.tempo += segundos
+    
+    def passos(self, dt_real):
+        """
+        Consome dt_real segundos de tempo real e gera um item por passo fixo
+        de simulação, avançando o relógio antes de cada um.
+        """
+        self.tempo_real = time.monotonic()
+        if self.pausado:
+            return
+        
+        self._acumulado += dt_real * self.escala
+        quantidade = int(self._acumulado / self.passo)
+        if quantidade > self.max_passos:
+            # Quadros muito atrasados: descarta o excesso para não entrar em espiral
+            quantidade = self.max_passos
+            self._acumulado = 0.0
+        else:
+            self._acumulado -= quantidade * self.passo
+        
+        for _ in range(quantidade):
+            self.tempo += self.passo
+            yield
@@ -0,0 +1,85 @@
+import pygame
+
+LARGURA_MINIMA_PAGINA = 512
+
+class SpriteAtlas:
+    """
+    Agrupa os sprites já redimensionados em poucas Surfaces grandes (páginas),
+    uma opaca e uma com transparência, convertidas para o formato do display.
+    Cada sprite é entregue como uma subsurface, acessada por chave
+    (ex: 'terra' ou ('milho', 3)).
+    """
+    
+    def __init__(self):
+        self.pendentes = {}  # {chave: Surface} ainda não empacotados
+        self.sprites = {}    # {chave: subsurface da página}
+        self.paginas = []
+    
+    def adicionar(self, chave, imagem):
+        self.pendentes[chave] = imagem
+    
+    def __getitem__(self, chave):
+        return self.sprites[chave]
+    
+    def __contains__(self, chave):
+        return chave in self.sprites
+    
+    def get(self, chave, padrao=None):
+        return self.sprites.get(chave, padrao)
+    
+    def construir(self):
+        """Empacota os sprites pendentes nas páginas e gera as subsurfaces"""
+        opacos = {}
+        transparentes = {}
+        for chave, imagem in self.pendentes.items():
+            if self._opaca(imagem):
+                opacos[chave] = imagem
+            else:
+                transparentes[chave] = imagem
+        
+        for grupo, alpha in ((opacos, False), (transparentes, True)):
+            if grupo:
+                self._empacotar(grupo, alpha)
+        self.pendentes = {}
+        return self
+    
+    @staticmethod
+    def _opaca(imagem):
+        if not imagem.get_flags() & pygame.SRCALPHA:
+            return True
+        # Imagens com canal alfa, mas sem nenhum pixel transparente, podem ir para a página opaca
+        largura, altura = imagem.get_size()
+        return pygame.mask.from_surface(imagem, 254).count() == largura * altura
+    
+    def _empacotar(self, imagens, alpha):
+        # Prateleiras: das imagens mais altas para as mais baixas, da esquerda para a direita
+        ordem = sorted(imagens, key=lambda chave: imagens[chave].get_height(), reverse=True)
+        largura_pagina = max(LARGURA_MINIMA_PAGINA, max(imagem.get_width() for imagem in imagens.values()))
+        
+        posicoes = {}
+        x = y = altura_prateleira = 0
+        for chave in ordem:
+            largura, altura = imagens[chave].get_size()
+            if x + largura > largura_pagina:
+                x = 0
+                y += altura_prateleira
+                altura_prateleira = 0
+            posicoes[chave] = (x, y)
+            x += largura
+            altura_prateleira = max(altura_prateleira, altura)
+        
+        tamanho = (largura_pagina, y + altura_prateleira)
+        if alpha:
+            pagina = pygame.Surface(tamanho, pygame.SRCALPHA)
+            pagina.fill((0, 0, 0, 0))
+        else:
+            pagina = pygame.Surface(tamanho)
+        for chave, posicao in posicoes.items():
+            pagina.blit(imagens[chave], posicao)
+        
+        if pygame.display.get_surface() is not None:
+            pagina = pagina.convert_alpha() if alpha else pagina.convert()
+        self.paginas.append(pagina)
+        
+        for chave, posicao in posicoes.items():
+            self.sprites[chave] = pagina.subsurface(pygame.Rect(posicao, imagens[chave].get_size()))
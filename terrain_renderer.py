@@ -0,0 +1,92 @@
+from collections import OrderedDict
+import pygame
+from config import CORES, TAMANHO_CELULA, TAMANHO_CHUNK
+
+TAMANHO_CHUNK_PIXELS = TAMANHO_CHUNK * TAMANHO_CELULA
+MAX_CHUNKS_EM_CACHE = 48  # ~1,6 MB por chunk de 640x640; cobre 1080p com folga
+
+class TerrainRenderer:
+    """
+    Desenha o terreno (grama, grade, terra aguada, terra adubada e buracos)
+    a partir de Surfaces pré-compostas por chunk do WorldStore.
+    Um chunk só é redesenhado quando a versão do seu terreno muda; os chunks
+    menos usados recentemente são descartados quando o cache enche.
+    """
+    
+    def __init__(self, max_chunks=MAX_CHUNKS_EM_CACHE):
+        self.max_chunks = max_chunks
+        self.cache = OrderedDict()  # {(chunk_x, chunk_y): (versão, Surface)}
+        self._sprites = None
+    
+    def invalidar(self):
+        self.cache.clear()
+    
+    def desenhar(self, tela, sprites, mundo, camera, largura, altura):
+        if sprites is not self._sprites:
+            # Sprites diferentes (ex: recarregados) invalidam tudo o que foi composto
+            self.invalidar()
+            self._sprites = sprites
+        
+        min_cx = int(camera.offset_x // TAMANHO_CHUNK_PIXELS)
+        max_cx = int((camera.offset_x + largura) // TAMANHO_CHUNK_PIXELS)
+        min_cy = int(camera.offset_y // TAMANHO_CHUNK_PIXELS)
+        max_cy = int((camera.offset_y + altura) // TAMANHO_CHUNK_PIXELS)
+        
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                superficie = self._obter_chunk((cx, cy), sprites, mundo)
+                tela.blit(superficie, camera.aplicar(cx * TAMANHO_CHUNK_PIXELS, cy * TAMANHO_CHUNK_PIXELS))
+        
+        # Descarta os chunks que saíram de vista há mais tempo
+        while len(self.cache) > self.max_chunks:
+            self.cache.popitem(last=False)
+    
+    def _obter_chunk(self, chave, sprites, mundo):
+        versao = mundo.versao_terreno(chave)
+        item = self.cache.get(chave)
+        if item is not None and item[0] == versao:
+            self.cache.move_to_end(chave)
+            return item[1]
+        
+        superficie = item[1] if item is not None else self._nova_superficie()
+        self._compor_chunk(superficie, chave, sprites, mundo)
+        self.cache[chave] = (versao, superficie)
+        self.cache.move_to_end(chave)
+        return superficie
+    
+    def _nova_superficie(self):
+        superficie = pygame.Surface((TAMANHO_CHUNK_PIXELS, TAMANHO_CHUNK_PIXELS))
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert()
+        return superficie
+    
+    def _compor_chunk(self, superficie, chave, sprites, mundo):
+        origem_x = chave[0] * TAMANHO_CHUNK_PIXELS
+        origem_y = chave[1] * TAMANHO_CHUNK_PIXELS
+        
+        # Grama alinhada ao mundo, para continuar contínua entre chunks vizinhos
+        grama = sprites['grama']
+        grama_width = grama.get_width()
+        grama_height = grama.get_height()
+        inicio_x = (origem_x // grama_width) * grama_width
+        inicio_y = (origem_y // grama_height) * grama_height
+        for i in range(inicio_x, origem_x + TAMANHO_CHUNK_PIXELS, grama_width):
+            for j in range(inicio_y, origem_y + TAMANHO_CHUNK_PIXELS, grama_height):
+                superficie.blit(grama, (i - origem_x, j - origem_y))
+        
+        # Grade (a borda direita/inferior pertence ao chunk vizinho)
+        for k in range(TAMANHO_CHUNK):
+            pos = k * TAMANHO_CELULA
+            pygame.draw.line(superficie, CORES['grade'], (pos, 0), (pos, TAMANHO_CHUNK_PIXELS), 1)
+            pygame.draw.line(superficie, CORES['grade'], (0, pos), (TAMANHO_CHUNK_PIXELS, pos), 1)
+        
+        camadas = [
+            (mundo.terra_aguada, sprites['terra_aguada']),
+            (mundo.terra_adubada, sprites['terra']),
+            (mundo.buracos_com_agua, sprites['agua'])
+        ]
+        base_x = chave[0] * TAMANHO_CHUNK
+        base_y = chave[1] * TAMANHO_CHUNK
+        for camada, sprite in camadas:
+            superficie.blits([(sprite, ((grid_x - base_x) * TAMANHO_CELULA, (grid_y - base_y) * TAMANHO_CELULA))
+                              for grid_x, grid_y in camada.chunks.get(chave, ())], doreturn=False)
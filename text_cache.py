@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+MAX_TEXTOS_EM_CACHE = 512
+
+class TextCache:
+    """
+    Cache LRU de textos renderizados, chaveado por (fonte, texto, cor, antialias).
+    As Surfaces devolvidas são compartilhadas: servem só para blit, não devem ser alteradas.
+    """
+    
+    def __init__(self, max_itens=MAX_TEXTOS_EM_CACHE):
+        self.max_itens = max_itens
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+    
+    def renderizar(self, fonte, texto, antialias, cor):
+        """Mesma assinatura de Font.render, mas reaproveita a Surface já renderizada"""
+        chave = (fonte, texto, tuple(cor), antialias)
+        superficie = self.itens.get(chave)
+        if superficie is not None:
+            self.acertos += 1
+            self.itens.move_to_end(chave)
+            return superficie
+        
+        self.falhas += 1
+        superficie = fonte.render(texto, antialias, cor)
+        self.itens[chave] = superficie
+        if len(self.itens) > self.max_itens:
+            self.itens.popitem(last=False)
+        return superficie
+    
+    def limpar(self):
+        self.itens.clear()
+        self.acertos = 0
+        self.falhas = 0
+    
+    def estatisticas(self):
+        return {'itens': len(self.itens), 'acertos': self.acertos, 'falhas': self.falhas}
+
+
+# Cache compartilhado por UI, Shop, PauseMenu e Menu
+cache_texto = TextCache()
+
+
+def renderizar_texto(fonte, texto, antialias, cor):
+    return cache_texto.renderizar(fonte, texto, antialias, cor)
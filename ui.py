@@ -1,45 +1,94 @@
 import pygame
-import time
-from config import TIPOS_SEMENTE, CORES, TAMANHO_CELULA, POCO_POS
+from config import TIPOS_SEMENTE, CORES, TAMANHO_CELULA, POCO_POS, ATUALIZACAO_PARCIAL_TELA
+from sim_clock import SimClock
+from terrain_renderer import TerrainRenderer, TAMANHO_CHUNK_PIXELS
+from dirty_rects import DirtyRectTracker
+from text_cache import renderizar_texto
+
+CORES_TRABALHADOR = {
+    'cultivador': (100, 255, 100),
+    'coletador': (255, 215, 0),
+    'adubador': (139, 69, 19)
+}
+ICONES_TRABALHADOR = {
+    'cultivador': '🌱',
+    'coletador': '🧺',
+    'adubador': '🪴'
+}
+# Sprite composto do trabalhador e onde ele fica em relação à posição (x, y) do trabalhador
+TAMANHO_SPRITE_TRABALHADOR = (40, 58)
+DESLOCAMENTO_TRABALHADOR = (-5, -8)
 
 class UI:
-    def __init__(self):
+    def __init__(self, relogio=None):
+        # Mensagens usam o tempo real do quadro: devem sumir mesmo com o jogo pausado ou acelerado
+        self.relogio = relogio if relogio is not None else SimClock()
         self.fonte = pygame.font.Font(None, 24)
         self.fonte_titulo = pygame.font.Font(None, 32)
         self.mensagem_save = ""
         self.tempo_mensagem = 0
+        self.terreno = TerrainRenderer()
+        self.hud = None
+        self._chave_hud = None
+        self.instrucoes = None
+        
+        # Regiões alteradas no quadro, para atualizar só elas no display
+        self.regioes = DirtyRectTracker(ATUALIZACAO_PARCIAL_TELA)
+        self._vista_anterior = None
+        self._versoes_vistas = {}
+        self._trabalhadores_anteriores = set()
+        
+        self._sprites_trabalhador = {}  # {(tipo, ativo): Surface}
+        self._sprites_base_trabalhador = None
+        self._mensagem_anterior = None
+        self._menus_anteriores = None
     
     def desenhar_interface(self, tela, player, water_system, modo_atual):
-        pygame.draw.rect(tela, CORES['fundo_interface'], (10, 10, 300, 200))
-        pygame.draw.rect(tela, CORES['borda_interface'], (10, 10, 300, 200), 2)
+        # O painel só é refeito quando o estado do jogador (versao), o modo ou os indicadores mudam
+        chave = (player, player.versao, modo_atual, water_system.tem_balde_agua, player.tem_poco)
+        if chave != self._chave_hud:
+            self.hud = self._renderizar_hud(player, water_system, modo_atual)
+            self._chave_hud = chave
+            self.regioes.marcar((10, 10, 300, 200))
+        tela.blit(self.hud, (10, 10))
+        
+        self._desenhar_instrucoes(tela)
+        self.desenhar_mensagem_save(tela, tela.get_width())
+    
+    def _renderizar_hud(self, player, water_system, modo_atual):
+        """Desenha o painel do jogador numa Surface própria de 300x200"""
+        hud = pygame.Surface((300, 200))
+        hud.fill(CORES['fundo_interface'])
+        pygame.draw.rect(hud, CORES['borda_interface'], (0, 0, 300, 200), 2)
         
-        texto_dinheiro = self.fonte.render(f"Dinheiro: ${player.dinheiro}", True, CORES['texto'])
-        tela.blit(texto_dinheiro, (20, 25))
+        texto_dinheiro = renderizar_texto(self.fonte, f"Dinheiro: ${player.dinheiro}", True, CORES['texto'])
+        hud.blit(texto_dinheiro, (10, 15))
         
-        y_offset = 50
+        y_offset = 40
         for tipo, quantidade in player.sementes.items():
             cor = TIPOS_SEMENTE[tipo]['cor']
             texto = f"{tipo.capitalize()}: {quantidade}"
             if tipo == player.semente_selecionada:
                 texto += " <- Selecionada"
-            texto_semente = self.fonte.render(texto, True, cor)
-            tela.blit(texto_semente, (20, y_offset))
+            texto_semente = renderizar_texto(self.fonte, texto, True, cor)
+            hud.blit(texto_semente, (10, y_offset))
             y_offset += 25
         
         modo_texto, cor_modo = self._get_modo_info(modo_atual)
-        texto_modo = self.fonte_titulo.render(modo_texto, True, cor_modo)
-        tela.blit(texto_modo, (20, 130))
+        texto_modo = renderizar_texto(self.fonte_titulo, modo_texto, True, cor_modo)
+        hud.blit(texto_modo, (10, 120))
         
         if water_system.tem_balde_agua:
-            texto_balde = self.fonte.render("💧 Carregando água", True, CORES['agua_indicador'])
-            tela.blit(texto_balde, (20, 160))
+            texto_balde = renderizar_texto(self.fonte, "💧 Carregando água", True, CORES['agua_indicador'])
+            hud.blit(texto_balde, (10, 150))
         
         if player.tem_poco:
-            texto_poco = self.fonte.render("🔧 Pressione P para posicionar poço", True, (255, 215, 0))
-            tela.blit(texto_poco, (20, 180))
+            texto_poco = renderizar_texto(self.fonte, "🔧 Pressione P para posicionar poço", True, (255, 215, 0))
+            hud.blit(texto_poco, (10, 170))
         
-        self._desenhar_instrucoes(tela)
-        self._desenhar_mensagem_save(tela, tela.get_width())
+        if pygame.display.get_surface() is not None:
+            hud = hud.convert()
+        return hud
     
     def _get_modo_info(self, modo_atual):
         modos = {
@@ -61,28 +110,42 @@ class UI:
             "1,2,3: Selecionar semente",
             "L: Abrir/Fechar Loja",
             "S: Salvar jogo",
+            "T: Velocidade do tempo",
             "F11: Alternar Tela Cheia",
         ]
         
-        y_offset = 390
-        for instrucao in instrucoes:
-            texto = self.fonte.render(instrucao, True, CORES['texto'])
-            tela.blit(texto, (20, y_offset))
-            y_offset += 20
+        # As instruções não mudam: são compostas uma vez numa Surface transparente
+        if self.instrucoes is None:
+            textos = [renderizar_texto(self.fonte, instrucao, True, CORES['texto']) for instrucao in instrucoes]
+            largura = max(texto.get_width() for texto in textos)
+            self.instrucoes = pygame.Surface((largura, 20 * len(textos)), pygame.SRCALPHA)
+            for i, texto in enumerate(textos):
+                self.instrucoes.blit(texto, (0, i * 20))
+        tela.blit(self.instrucoes, (20, 390))
     
-    def _desenhar_mensagem_save(self, tela, largura_tela):
-        if self.mensagem_save and (time.time() - self.tempo_mensagem < 3):
+    def desenhar_mensagem_save(self, tela, largura_tela):
+        mensagem = None
+        if self.mensagem_save and (self.relogio.tempo_real - self.tempo_mensagem < 3):
             cor_mensagem = CORES['verde_sucesso'] if "sucesso" in self.mensagem_save else CORES['vermelho_erro']
-            texto_save = self.fonte.render(self.mensagem_save, True, cor_mensagem)
-            tela.blit(texto_save, (largura_tela // 2 - texto_save.get_width() // 2, 30))
+            texto_save = renderizar_texto(self.fonte, self.mensagem_save, True, cor_mensagem)
+            rect = texto_save.get_rect(topleft=(largura_tela // 2 - texto_save.get_width() // 2, 30))
+            tela.blit(texto_save, rect)
+            mensagem = (self.mensagem_save, tuple(rect))
+        
+        # A mensagem aparecendo, trocando ou sumindo altera a região dela
+        if mensagem != self._mensagem_anterior:
+            for anterior in (self._mensagem_anterior, mensagem):
+                if anterior is not None:
+                    self.regioes.marcar(anterior[1])
+            self._mensagem_anterior = mensagem
     
     def mostrar_mensagem_save(self, mensagem):
         self.mensagem_save = mensagem
-        self.tempo_mensagem = time.time()
+        self.tempo_mensagem = self.relogio.tempo_real
     
     def desenhar_planta(self, tela, x, y, tipo_semente, estagio, sprites):
-        if tipo_semente in sprites['plantas'] and estagio in sprites['plantas'][tipo_semente]:
-            sprite = sprites['plantas'][tipo_semente][estagio]
+        sprite = sprites['atlas'].get((tipo_semente, estagio))
+        if sprite is not None:
             tela.blit(sprite, (x, y))
         else:
             cor = TIPOS_SEMENTE.get(tipo_semente, {}).get('cor', (255, 255, 255))
@@ -98,59 +161,63 @@ class UI:
         min_grid_y = int(camera.offset_y // TAMANHO_CELULA) - 2
         max_grid_y = int((camera.offset_y + altura) // TAMANHO_CELULA) + 2
         
-        # Desenhar grama de fundo
-        grama_width = sprites['grama'].get_width()
-        grama_height = sprites['grama'].get_height()
-        
-        inicio_x = int((camera.offset_x // grama_width) * grama_width)
-        inicio_y = int((camera.offset_y // grama_height) * grama_height)
-        
-        for i in range(inicio_x, int(camera.offset_x + largura + grama_width), grama_width):
-            for j in range(inicio_y, int(camera.offset_y + altura + grama_height), grama_height):
-                tela_x, tela_y = camera.aplicar(i, j)
-                tela.blit(sprites['grama'], (tela_x, tela_y))
-        
-        # Desenhar grade
-        for i in range(min_grid_x, max_grid_x + 1):
-            mundo_x = i * TAMANHO_CELULA
-            tela_x, _ = camera.aplicar(mundo_x, 0)
-            pygame.draw.line(tela, CORES['grade'], (tela_x, 0), (tela_x, altura), 1)
-        
-        for j in range(min_grid_y, max_grid_y + 1):
-            mundo_y = j * TAMANHO_CELULA
-            _, tela_y = camera.aplicar(0, mundo_y)
-            pygame.draw.line(tela, CORES['grade'], (0, tela_y), (largura, tela_y), 1)
-        
-        # Desenhar terra aguada (apenas células visíveis)
-        for (grid_x, grid_y) in water_system.terra_aguada:
-            if min_grid_x <= grid_x <= max_grid_x and min_grid_y <= grid_y <= max_grid_y:
-                tela_x, tela_y = camera.aplicar_grid(grid_x, grid_y, TAMANHO_CELULA)
-                tela.blit(sprites['terra_aguada'], (tela_x, tela_y))
-        
-        # Desenhar terra adubada (apenas células visíveis)
-        for (grid_x, grid_y) in farm_system.terra_adubada:
-            if min_grid_x <= grid_x <= max_grid_x and min_grid_y <= grid_y <= max_grid_y:
-                tela_x, tela_y = camera.aplicar_grid(grid_x, grid_y, TAMANHO_CELULA)
-                tela.blit(sprites['terra'], (tela_x, tela_y))
+        # Terreno (grama, grade, terra aguada/adubada e buracos) vem pré-composto por chunk
+        self.terreno.desenhar(tela, sprites, water_system.mundo, camera, largura, altura)
+        self._marcar_cenario_alterado(water_system, camera, largura, altura)
         
         # Desenhar todos os poços
-        for poco_pos in water_system.pocos:
-            poco_x = poco_pos[0] * TAMANHO_CELULA
-            poco_y = poco_pos[1] * TAMANHO_CELULA
-            tela_x, tela_y = camera.aplicar(poco_x, poco_y)
-            tela.blit(sprites['poco'], (tela_x, tela_y))
-        
-        # Desenhar buracos com água (apenas células visíveis)
-        for (grid_x, grid_y) in water_system.buracos_com_agua:
-            if min_grid_x <= grid_x <= max_grid_x and min_grid_y <= grid_y <= max_grid_y:
-                tela_x, tela_y = camera.aplicar_grid(grid_x, grid_y, TAMANHO_CELULA)
-                tela.blit(sprites['agua'], (tela_x, tela_y))
-        
-        # Desenhar plantas (apenas células visíveis)
-        for (grid_x, grid_y), planta in farm_system.fazenda.items():
-            if min_grid_x <= grid_x <= max_grid_x and min_grid_y <= grid_y <= max_grid_y:
-                tela_x, tela_y = camera.aplicar_grid(grid_x, grid_y, TAMANHO_CELULA)
-                self.desenhar_planta(tela, tela_x, tela_y, planta['tipo'], planta['estagio'], sprites)
+        lista_pocos = [(sprites['poco'], camera.aplicar_grid(poco_pos[0], poco_pos[1], TAMANHO_CELULA))
+                       for poco_pos in water_system.pocos]
+        tela.blits(lista_pocos, doreturn=False)
+        
+        # Desenhar plantas (apenas chunks visíveis), agrupadas por sprite
+        atlas = sprites['atlas']
+        offset_x, offset_y = camera.offset_x, camera.offset_y
+        grupos = {}
+        for (grid_x, grid_y), planta in farm_system.fazenda.itens_no_retangulo(min_grid_x, min_grid_y, max_grid_x, max_grid_y):
+            chave = (planta.tipo, planta.estagio)
+            posicao = (grid_x * TAMANHO_CELULA - offset_x, grid_y * TAMANHO_CELULA - offset_y)
+            if chave in grupos:
+                grupos[chave].append(posicao)
+            else:
+                grupos[chave] = [posicao]
+        self._desenhar_grupos(tela, grupos, atlas, sprites)
+    
+    def _marcar_cenario_alterado(self, water_system, camera, largura, altura):
+        """Marca a tela toda se a câmera mudou, senão só os chunks visíveis que mudaram"""
+        vista = (camera.offset_x, camera.offset_y, largura, altura, len(water_system.pocos))
+        if vista != self._vista_anterior:
+            self.regioes.marcar_tudo()
+            self._vista_anterior = vista
+        
+        mundo = water_system.mundo
+        versoes = {}
+        for cx in range(int(camera.offset_x // TAMANHO_CHUNK_PIXELS), int((camera.offset_x + largura) // TAMANHO_CHUNK_PIXELS) + 1):
+            for cy in range(int(camera.offset_y // TAMANHO_CHUNK_PIXELS), int((camera.offset_y + altura) // TAMANHO_CHUNK_PIXELS) + 1):
+                versao = versoes[(cx, cy)] = mundo.versao_chunk((cx, cy))
+                if self._versoes_vistas.get((cx, cy)) != versao:
+                    tela_x, tela_y = camera.aplicar(cx * TAMANHO_CHUNK_PIXELS, cy * TAMANHO_CHUNK_PIXELS)
+                    self.regioes.marcar((tela_x, tela_y, TAMANHO_CHUNK_PIXELS, TAMANHO_CHUNK_PIXELS))
+        self._versoes_vistas = versoes
+    
+    def marcar_menus(self, *estados):
+        """Abrir, fechar ou trocar de menu sobrepõe a tela toda"""
+        if estados != self._menus_anteriores:
+            self.regioes.marcar_tudo()
+            self._menus_anteriores = estados
+    
+    def atualizar_display(self, tela):
+        self.regioes.enviar(tela)
+    
+    def _desenhar_grupos(self, tela, grupos, atlas, sprites):
+        """Envia cada grupo {(tipo, estagio): [posições]} numa única chamada de blits"""
+        for chave, posicoes in grupos.items():
+            sprite = atlas.get(chave)
+            if sprite is None:
+                for x, y in posicoes:
+                    self.desenhar_planta(tela, x, y, chave[0], chave[1], sprites)
+            else:
+                tela.blits([(sprite, posicao) for posicao in posicoes], doreturn=False)
     
     def desenhar_cursor(self, tela, player, camera):
         grid_x, grid_y = player.get_grid_position()
@@ -158,41 +225,62 @@ class UI:
         pygame.draw.rect(tela, CORES['texto'], (tela_x, tela_y, TAMANHO_CELULA, TAMANHO_CELULA), 2)
     
     def desenhar_trabalhadores(self, tela, worker_system, sprites, camera):
-        cores_trabalhador = {
-            'cultivador': (100, 255, 100),
-            'coletador': (255, 215, 0),
-            'adubador': (139, 69, 19)
-        }
+        if sprites is not self._sprites_base_trabalhador:
+            self._sprites_trabalhador = {}
+            self._sprites_base_trabalhador = sprites
         
-        for tipo, x, y, ativo in worker_system.obter_trabalhadores_ativos():
+        desenhados = set()
+        lista = []
+        largura_tela = tela.get_width()
+        altura_tela = tela.get_height()
+        for indice, (tipo, x, y, ativo) in enumerate(worker_system.obter_trabalhadores_ativos()):
             # Converter posição do mundo para tela
             tela_x, tela_y = camera.aplicar(x, y)
             
             # Verificar se está visível
-            if -50 <= tela_x <= tela.get_width() + 50 and -50 <= tela_y <= tela.get_height() + 50:
-                cor = cores_trabalhador.get(tipo, (255, 255, 255))
-                
-                # Se inativo, deixar com cor mais escura/opaca
-                if not ativo:
-                    cor = tuple(c // 3 for c in cor)  # Escurecer cor
-                
-                corpo_rect = pygame.Rect(int(tela_x), int(tela_y) + 10, 25, 35)
-                pygame.draw.rect(tela, cor, corpo_rect, border_radius=5)
-                pygame.draw.rect(tela, (0, 0, 0), corpo_rect, 2, border_radius=5)
-                
-                pygame.draw.circle(tela, cor, (int(tela_x + 12), int(tela_y + 8)), 8)
-                pygame.draw.circle(tela, (0, 0, 0), (int(tela_x + 12), int(tela_y + 8)), 8, 2)
-                
-                # Adicionar "Z" para trabalhadores inativos (dormindo)
-                if not ativo:
-                    texto_z = self.fonte.render("Z", True, (200, 200, 200))
-                    tela.blit(texto_z, (int(tela_x + 20), int(tela_y - 5)))
-                
-                icone_map = {
-                    'cultivador': '🌱',
-                    'coletador': '🧺',
-                    'adubador': '🪴'
-                }
-                icone = icone_map.get(tipo, '👷')
-                texto_icone = self.fonte.render(icone, True, (0, 0, 0))
-                tela.blit(texto_icone, (int(tela_x + 2), int(tela_y + 18)))
+            if -50 <= tela_x <= largura_tela + 50 and -50 <= tela_y <= altura_tela + 50:
+                tela_x, tela_y = int(tela_x), int(tela_y)
+                # O índice diferencia trabalhadores iguais no mesmo lugar e a ordem de desenho
+                desenhados.add((indice, tipo, tela_x, tela_y, ativo))
+                lista.append((self._obter_sprite_trabalhador(tipo, ativo, sprites),
+                              (tela_x + DESLOCAMENTO_TRABALHADOR[0], tela_y + DESLOCAMENTO_TRABALHADOR[1])))
+        tela.blits(lista, doreturn=False)
+        
+        # Só os trabalhadores que se moveram ou mudaram de estado sujam a tela (posição antiga e nova)
+        for _, _, tela_x, tela_y, _ in desenhados ^ self._trabalhadores_anteriores:
+            self.regioes.marcar((tela_x + DESLOCAMENTO_TRABALHADOR[0], tela_y + DESLOCAMENTO_TRABALHADOR[1])
+                                + TAMANHO_SPRITE_TRABALHADOR)
+        self._trabalhadores_anteriores = desenhados
+    
+    def _obter_sprite_trabalhador(self, tipo, ativo, sprites):
+        """Sprite composto uma vez por (tipo, ativo): personagem, selo do tipo e o Z de dormindo"""
+        chave = (tipo, ativo)
+        sprite = self._sprites_trabalhador.get(chave)
+        if sprite is not None:
+            return sprite
+        
+        cor = CORES_TRABALHADOR.get(tipo, (255, 255, 255))
+        corpo = sprites['trabalhador']
+        if not ativo:
+            # Se inativo, deixar mais escuro
+            cor = tuple(c // 3 for c in cor)
+            corpo = corpo.copy()
+            corpo.fill((85, 85, 85), special_flags=pygame.BLEND_RGB_MULT)
+        
+        sprite = pygame.Surface(TAMANHO_SPRITE_TRABALHADOR, pygame.SRCALPHA)
+        sprite.blit(corpo, (-DESLOCAMENTO_TRABALHADOR[0], -DESLOCAMENTO_TRABALHADOR[1]))
+        
+        pygame.draw.circle(sprite, cor, (9, 46), 8)
+        pygame.draw.circle(sprite, (0, 0, 0), (9, 46), 8, 2)
+        texto_icone = renderizar_texto(self.fonte, ICONES_TRABALHADOR.get(tipo, '👷'), True, (0, 0, 0))
+        sprite.blit(texto_icone, texto_icone.get_rect(center=(9, 46)))
+        
+        # Adicionar "Z" para trabalhadores inativos (dormindo)
+        if not ativo:
+            texto_z = renderizar_texto(self.fonte, "Z", True, (200, 200, 200))
+            sprite.blit(texto_z, (27, 0))
+        
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        self._sprites_trabalhador[chave] = sprite
+        return sprite
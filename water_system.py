@@ -1,9 +1,31 @@
+from collections import Counter
 from config import POCO_POS
+from world_store import WorldStore
+
+RAIO_AGUA = 5
+
+# Deslocamentos do losango (distância manhattan <= RAIO_AGUA) irrigado por um buraco
+OFFSETS_AGUA = tuple(
+    (dx, dy)
+    for dx in range(-RAIO_AGUA, RAIO_AGUA + 1)
+    for dy in range(-RAIO_AGUA, RAIO_AGUA + 1)
+    if abs(dx) + abs(dy) <= RAIO_AGUA
+)
+
+AREA_POCO = frozenset({
+    POCO_POS,
+    (POCO_POS[0] + 1, POCO_POS[1]),
+    (POCO_POS[0], POCO_POS[1] + 1),
+    (POCO_POS[0] + 1, POCO_POS[1] + 1)
+})
 
 class WaterSystem:
-    def __init__(self):
-        self.buracos_com_agua = set()
-        self.terra_aguada = set()
+    def __init__(self, mundo=None):
+        self.mundo = mundo if mundo is not None else WorldStore()
+        self.buracos_com_agua = self.mundo.buracos_com_agua
+        self.terra_aguada = self.mundo.terra_aguada
+        self.cobertura_agua = {}  # {(grid_x, grid_y): quantidade de buracos que irrigam o tile}
+        self.terra_secada = set()  # Tiles que deixaram de ser aguados desde a última consulta
         self.tem_balde_agua = False
         self.pocos = [POCO_POS]  # Lista de posições de poços (começa com o poço padrão)
     
@@ -27,19 +49,51 @@ class WaterSystem:
         return True, "sucesso"
     
     def atualizar_terra_aguada(self):
-        self.terra_aguada.clear()
+        """Reconstrói toda a cobertura de água a partir dos buracos (usado ao carregar)"""
+        cobertura = Counter([(buraco_x + dx, buraco_y + dy)
+                             for buraco_x, buraco_y in self.buracos_com_agua
+                             for dx, dy in OFFSETS_AGUA])
+        self.cobertura_agua = cobertura
         
-        for buraco in self.buracos_com_agua:
-            for dx in range(-5, 6):
-                for dy in range(-5, 6):
-                    if self.distancia_manhattan((0, 0), (dx, dy)) <= 5:
-                        pos_terra = (buraco[0] + dx, buraco[1] + dy)
-                        if (pos_terra not in self.buracos_com_agua and 
-                            pos_terra != POCO_POS and
-                            pos_terra != (POCO_POS[0] + 1, POCO_POS[1]) and
-                            pos_terra != (POCO_POS[0], POCO_POS[1] + 1) and
-                            pos_terra != (POCO_POS[0] + 1, POCO_POS[1] + 1)):
-                            self.terra_aguada.add(pos_terra)
+        # Em bloco: as tarefas e versões são refeitas por chunk, não a cada tile
+        terra_anterior = set(self.terra_aguada)
+        terra_aguada = cobertura.keys() - set(self.buracos_com_agua) - AREA_POCO
+        self.mundo.recarregar_camada(self.terra_aguada, terra_aguada)
+        self.terra_secada.update(terra_anterior - terra_aguada)
+    
+    def _aplicar_cobertura(self, buraco, delta):
+        """Soma delta à cobertura do losango ao redor do buraco e atualiza terra_aguada"""
+        cobertura = self.cobertura_agua
+        for dx, dy in OFFSETS_AGUA:
+            pos_terra = (buraco[0] + dx, buraco[1] + dy)
+            quantidade = cobertura.get(pos_terra, 0) + delta
+            if quantidade > 0:
+                cobertura[pos_terra] = quantidade
+                if (pos_terra not in self.buracos_com_agua and 
+                    pos_terra not in AREA_POCO):
+                    self.terra_aguada.add(pos_terra)
+            else:
+                cobertura.pop(pos_terra, None)
+                if pos_terra in self.terra_aguada:
+                    self.terra_aguada.discard(pos_terra)
+                    self.terra_secada.add(pos_terra)
+    
+    def _adicionar_buraco(self, posicao):
+        self.buracos_com_agua.add(posicao)
+        if posicao in self.terra_aguada:
+            self.terra_aguada.discard(posicao)
+            self.terra_secada.add(posicao)
+        self._aplicar_cobertura(posicao, 1)
+    
+    def _remover_buraco(self, posicao):
+        self.buracos_com_agua.discard(posicao)
+        self._aplicar_cobertura(posicao, -1)
+    
+    def consumir_terra_secada(self):
+        """Retorna e limpa os tiles que secaram desde a última chamada"""
+        secada = self.terra_secada
+        self.terra_secada = set()
+        return secada
     
     def cavar_buraco(self, grid_x, grid_y, fazenda):
         posicao = (grid_x, grid_y)
@@ -62,7 +116,7 @@ class WaterSystem:
             posicao != (POCO_POS[0], POCO_POS[1] + 1) and
             posicao != (POCO_POS[0] + 1, POCO_POS[1] + 1)):
             if player.gastar_dinheiro(5):
-                self.buracos_com_agua.add(posicao)
+                self._adicionar_buraco(posicao)
                 self.tem_balde_agua = False
                 return True, "agua_colocada"
             else:
@@ -83,22 +137,39 @@ class WaterSystem:
     def remover_agua(self, grid_x, grid_y):
         posicao = (grid_x, grid_y)
         if posicao in self.buracos_com_agua:
-            self.buracos_com_agua.discard(posicao)
-            self.atualizar_terra_aguada()
+            self._remover_buraco(posicao)
             return True
         return False
     
     def carregar_dados(self, buracos, terra_aguada, pocos=None):
-        self.buracos_com_agua = set(tuple(pos) for pos in buracos)
-        self.terra_aguada = set(tuple(pos) for pos in terra_aguada)
+        # terra_aguada é derivada dos buracos; o valor salvo é ignorado e a cobertura é refeita
+        self.mundo.recarregar_camada(self.buracos_com_agua, (tuple(pos) for pos in buracos))
         if pocos:
             self.pocos = [tuple(pos) for pos in pocos]
         else:
             self.pocos = [POCO_POS]
+        self.atualizar_terra_aguada()
     
-    def obter_dados_save(self):
+    def obter_snapshot(self, posicoes=None):
+        """
+        Cópia barata do estado; a formatação para o save pode ser feita em outra thread.
+        Com posicoes, inclui só esses buracos (os poços vão sempre inteiros e a terra
+        aguada, derivada dos buracos, fica de fora).
+        """
+        if posicoes is None:
+            return {
+                'buracos_com_agua': list(self.buracos_com_agua),
+                'terra_aguada': list(self.terra_aguada),
+                'pocos': list(self.pocos)
+            }
         return {
-            'buracos_com_agua': [list(pos) for pos in self.buracos_com_agua],
-            'terra_aguada': [list(pos) for pos in self.terra_aguada],
-            'pocos': [list(pos) for pos in self.pocos]
+            'buracos_com_agua': [posicao for posicao in posicoes if posicao in self.buracos_com_agua],
+            'pocos': list(self.pocos)
         }
+    
+    @staticmethod
+    def formatar_dados_save(snapshot):
+        return {chave: [list(pos) for pos in posicoes] for chave, posicoes in snapshot.items()}
+    
+    def obter_dados_save(self):
+        return self.formatar_dados_save(self.obter_snapshot())
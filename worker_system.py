@@ -1,6 +1,21 @@
-import time
+import heapq
 import random
-from config import TAMANHO_CELULA, LARGURA, ALTURA
+from config import TAMANHO_CELULA, LARGURA, ALTURA, MODO_AGENDAMENTO_TRABALHADORES
+from sim_clock import SimClock
+
+MODOS_AGENDAMENTO = ('individual', 'lote')
+DURACAO_RESERVA = 30  # Segundos até a reserva de uma tarefa expirar
+LIMITE_CANDIDATOS_LOTE = 16  # Tarefas mais próximas consideradas por worker no casamento em lote
+INTERVALO_TRABALHO = 0.5  # Segundos entre duas tarefas de um trabalhador
+INTERVALO_PAGAMENTO = 20  # Segundos entre dois pagamentos de manutenção
+CUSTO_MANUTENCAO = 5  # Valor de cada pagamento
+
+# Índice de tarefas do WorldStore que cada tipo de trabalhador consome
+TAREFA_POR_TIPO = {
+    'cultivador': 'plantar',
+    'coletador': 'colher',
+    'adubador': 'adubar'
+}
 
 
 class WorkerConsciousness:
@@ -8,73 +23,112 @@ class WorkerConsciousness:
     Sistema de consciência para trabalhadores.
     Gerencia a alocação de tarefas garantindo que dois trabalhadores
     não trabalhem na mesma tarefa simultaneamente.
+    
+    Mantém a tabela nos dois sentidos (tarefa -> worker e worker -> tarefas)
+    e reservas com prazo, para que tarefas de workers travados não fiquem
+    presas para sempre.
     """
-    def __init__(self):
+    def __init__(self, duracao_reserva=DURACAO_RESERVA):
         self.tarefas_alocadas = {}  # {(grid_x, grid_y): worker_id}
+        self.tarefas_por_worker = {}  # {worker_id: {(grid_x, grid_y), ...}}
+        self.expiracao_tarefas = {}  # {(grid_x, grid_y): tempo em que a reserva expira}
+        self._heap_expiracao = []  # (tempo, posicao); entradas obsoletas são ignoradas
+        self.duracao_reserva = duracao_reserva
         self.worker_id_counter = 0
     
     def gerar_id_worker(self):
         self.worker_id_counter += 1
         return self.worker_id_counter
     
-    def alocar_tarefa(self, posicao, worker_id):
-        """Aloca uma tarefa para um worker específico"""
+    def alocar_tarefa(self, posicao, worker_id, tempo_atual=None):
+        """Aloca uma tarefa para um worker específico (com prazo se tempo_atual for informado)"""
         if posicao not in self.tarefas_alocadas:
             self.tarefas_alocadas[posicao] = worker_id
+            self.tarefas_por_worker.setdefault(worker_id, set()).add(posicao)
+            if tempo_atual is not None:
+                expira_em = tempo_atual + self.duracao_reserva
+                self.expiracao_tarefas[posicao] = expira_em
+                heapq.heappush(self._heap_expiracao, (expira_em, posicao))
             return True
         return False
     
     def desalocar_tarefa(self, posicao, worker_id):
         """Desaloca uma tarefa se pertencer ao worker"""
         if self.tarefas_alocadas.get(posicao) == worker_id:
-            del self.tarefas_alocadas[posicao]
+            self._remover_reserva(posicao)
             return True
         return False
     
+    def _remover_reserva(self, posicao):
+        worker_id = self.tarefas_alocadas.pop(posicao)
+        self.expiracao_tarefas.pop(posicao, None)
+        tarefas = self.tarefas_por_worker.get(worker_id)
+        if tarefas is not None:
+            tarefas.discard(posicao)
+            if not tarefas:
+                del self.tarefas_por_worker[worker_id]
+    
     def tarefa_esta_alocada(self, posicao):
         """Verifica se uma tarefa já está alocada para outro worker"""
         return posicao in self.tarefas_alocadas
     
+    def reserva_do_worker(self, posicao, worker_id):
+        """Verifica se a tarefa continua reservada para o worker (a reserva pode ter expirado)"""
+        return self.tarefas_alocadas.get(posicao) == worker_id
+    
     def obter_tarefas_do_worker(self, worker_id):
         """Retorna todas as tarefas alocadas para um worker"""
-        return [pos for pos, wid in self.tarefas_alocadas.items() if wid == worker_id]
+        return list(self.tarefas_por_worker.get(worker_id, ()))
     
     def limpar_tarefas_worker(self, worker_id):
-        """Remove todas as tarefas de um worker (para quando ele é removido)"""
-        posicoes_para_remover = [pos for pos, wid in self.tarefas_alocadas.items() if wid == worker_id]
-        for pos in posicoes_para_remover:
+        """Remove todas as tarefas de um worker (para quando ele é removido ou fica inativo)"""
+        for pos in self.tarefas_por_worker.pop(worker_id, ()):
             del self.tarefas_alocadas[pos]
+            self.expiracao_tarefas.pop(pos, None)
+    
+    def expirar_reservas(self, tempo_atual):
+        """Libera as reservas cujo prazo já venceu; retorna quantas foram liberadas"""
+        heap = self._heap_expiracao
+        liberadas = 0
+        while heap and heap[0][0] <= tempo_atual:
+            expira_em, posicao = heapq.heappop(heap)
+            # Entrada obsoleta: reserva já liberada ou refeita com outro prazo
+            if self.expiracao_tarefas.get(posicao) != expira_em:
+                continue
+            self._remover_reserva(posicao)
+            liberadas += 1
+        return liberadas
 
 
 class Worker:
-    def __init__(self, tipo, posicao_inicial):
+    def __init__(self, tipo, posicao_inicial, relogio=None):
+        self.relogio = relogio if relogio is not None else SimClock()
         self.tipo = tipo
         self.x = posicao_inicial[0]
         self.y = posicao_inicial[1]
         self.ativo = True
-        self.ultimo_trabalho = time.time()
-        self.intervalo_trabalho = 0.5
+        self.ultimo_trabalho = self.relogio.agora()
+        self.intervalo_trabalho = INTERVALO_TRABALHO
         self.alvo_atual = None
         self.velocidade = 12
         self.tempo_sem_trabalho = 0
-        self.ultimo_check = time.time()
+        self.ultimo_check = self.relogio.agora()
         self.direcao_patrulha = [random.choice([-1, 1]), random.choice([-1, 1])]
-        self.ultimo_pagamento = time.time()
-        self.intervalo_pagamento = 20  # 20 segundos
-        self.custo_manutencao = 5  # $5 por pagamento
+        self.ultimo_pagamento = self.relogio.agora()
+        self.intervalo_pagamento = INTERVALO_PAGAMENTO
+        self.custo_manutencao = CUSTO_MANUTENCAO
         self.worker_id = None  # Será definido quando criado no WorkerSystem
     
     def encontrar_proximo_alvo(self, farm_system, water_system, player):
         grid_x = int(self.x // TAMANHO_CELULA)
         grid_y = int(self.y // TAMANHO_CELULA)
         
-        if self.tipo == 'cultivador':
-            return self._encontrar_terra_para_plantar(farm_system, water_system, grid_x, grid_y)
-        elif self.tipo == 'coletador':
-            return self._encontrar_planta_para_colher(farm_system, grid_x, grid_y)
-        elif self.tipo == 'adubador':
-            return self._encontrar_terra_para_adubar(farm_system, water_system, grid_x, grid_y)
-        return None
+        tarefa = TAREFA_POR_TIPO.get(self.tipo)
+        if tarefa is None:
+            return None
+        
+        alvos = farm_system.mundo.tarefas[tarefa].k_proximos(grid_x, grid_y, 1)
+        return alvos[0][1] if alvos else None
     
     def encontrar_proximo_alvo_consciente(self, farm_system, water_system, player, worker_consciousness):
         """
@@ -87,99 +141,23 @@ class Worker:
         grid_x = int(self.x // TAMANHO_CELULA)
         grid_y = int(self.y // TAMANHO_CELULA)
         
-        if self.tipo == 'cultivador':
-            alvos = self._gerar_lista_terra_para_plantar(farm_system, water_system, grid_x, grid_y)
-        elif self.tipo == 'coletador':
-            alvos = self._gerar_lista_planta_para_colher(farm_system, grid_x, grid_y)
-        elif self.tipo == 'adubador':
-            alvos = self._gerar_lista_terra_para_adubar(farm_system, water_system, grid_x, grid_y)
-        else:
+        tarefa = TAREFA_POR_TIPO.get(self.tipo)
+        if tarefa is None:
             return None
+        # Gerado sob demanda pela grade de chunks: nada é ordenado
+        alvos = farm_system.mundo.tarefas[tarefa].proximos(grid_x, grid_y)
         
         # Passo 1 & 2: Encontrar o tile mais próximo que não está alocado
         for distancia, posicao in alvos:
             # Passo 2: Verificar se ninguém já vai fazer essa tarefa
             if not worker_consciousness.tarefa_esta_alocada(posicao):
                 # Passo 3: Alocar a tarefa para este worker
-                if worker_consciousness.alocar_tarefa(posicao, self.worker_id):
+                if worker_consciousness.alocar_tarefa(posicao, self.worker_id, self.relogio.agora()):
                     return posicao
         
         # Se nenhuma tarefa disponível foi encontrada
         return None
     
-    def _encontrar_terra_para_plantar(self, farm_system, water_system, worker_x, worker_y):
-        alvos_proximos = []
-        for pos in farm_system.terra_adubada:
-            if pos not in farm_system.fazenda:
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        if alvos_proximos:
-            alvos_proximos.sort(key=lambda x: x[0])
-            return alvos_proximos[0][1]
-        return None
-    
-    def _encontrar_planta_para_colher(self, farm_system, worker_x, worker_y):
-        alvos_proximos = []
-        for pos, planta in farm_system.fazenda.items():
-            if planta['estagio'] == 6 and not planta.get('estragada', False):
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        if alvos_proximos:
-            alvos_proximos.sort(key=lambda x: x[0])
-            return alvos_proximos[0][1]
-        return None
-    
-    def _encontrar_terra_para_adubar(self, farm_system, water_system, worker_x, worker_y):
-        alvos_proximos = []
-        for pos in water_system.terra_aguada:
-            if (pos not in farm_system.terra_adubada and 
-                pos not in farm_system.fazenda and
-                pos not in water_system.buracos_com_agua):
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        if alvos_proximos:
-            alvos_proximos.sort(key=lambda x: x[0])
-            return alvos_proximos[0][1]
-        return None
-    
-    def _gerar_lista_terra_para_plantar(self, farm_system, water_system, worker_x, worker_y):
-        """Retorna lista ordenada por distância de terras para plantar"""
-        alvos_proximos = []
-        for pos in farm_system.terra_adubada:
-            if pos not in farm_system.fazenda:
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        alvos_proximos.sort(key=lambda x: x[0])
-        return alvos_proximos
-    
-    def _gerar_lista_planta_para_colher(self, farm_system, worker_x, worker_y):
-        """Retorna lista ordenada por distância de plantas para colher"""
-        alvos_proximos = []
-        for pos, planta in farm_system.fazenda.items():
-            if planta['estagio'] == 6 and not planta.get('estragada', False):
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        alvos_proximos.sort(key=lambda x: x[0])
-        return alvos_proximos
-    
-    def _gerar_lista_terra_para_adubar(self, farm_system, water_system, worker_x, worker_y):
-        """Retorna lista ordenada por distância de terras para adubar"""
-        alvos_proximos = []
-        for pos in water_system.terra_aguada:
-            if (pos not in farm_system.terra_adubada and 
-                pos not in farm_system.fazenda and
-                pos not in water_system.buracos_com_agua):
-                distancia = abs(pos[0] - worker_x) + abs(pos[1] - worker_y)
-                alvos_proximos.append((distancia, pos))
-        
-        alvos_proximos.sort(key=lambda x: x[0])
-        return alvos_proximos
-    
     def patrulhar(self):
         self.x += self.direcao_patrulha[0] * self.velocidade
         self.y += self.direcao_patrulha[1] * self.velocidade
@@ -225,8 +203,13 @@ class Worker:
         
         return False
     
-    def executar_trabalho(self, farm_system, water_system, player, worker_consciousness):
-        tempo_atual = time.time()
+    def esta_ocioso(self, tempo_atual):
+        """Ativo, sem alvo e já pronto para o próximo trabalho"""
+        return (self.ativo and not self.alvo_atual and
+                tempo_atual - self.ultimo_trabalho >= self.intervalo_trabalho)
+    
+    def executar_trabalho(self, farm_system, water_system, player, worker_consciousness, buscar_alvo=True):
+        tempo_atual = self.relogio.agora()
         
         # Sistema de pagamento: cobrar manutenção a cada 20 segundos
         if tempo_atual - self.ultimo_pagamento >= self.intervalo_pagamento:
@@ -237,6 +220,9 @@ class Worker:
             else:
                 # Se não tiver dinheiro, trabalhador para de trabalhar mas não é removido
                 self.ativo = False
+                # Libera de uma vez tudo que ele tinha reservado
+                worker_consciousness.limpar_tarefas_worker(self.worker_id)
+                self.alvo_atual = None
                 print(f"Trabalhador {self.tipo} parou de trabalhar por falta de pagamento!")
                 return False
         
@@ -244,6 +230,10 @@ class Worker:
             return False
         
         if not self.alvo_atual:
+            if not buscar_alvo:
+                # No modo em lote o alvo é atribuído pelo WorkerSystem
+                return False
+            
             # Usar a dinâmica consciente para encontrar próximo alvo
             self.alvo_atual = self.encontrar_proximo_alvo_consciente(
                 farm_system, water_system, player, worker_consciousness
@@ -252,24 +242,18 @@ class Worker:
             if not self.alvo_atual:
                 # Não tem trabalho disponível
                 return False
+        elif not worker_consciousness.reserva_do_worker(self.alvo_atual, self.worker_id):
+            # A reserva expirou e a tarefa pode já ser de outro worker: abandona o alvo
+            self.alvo_atual = None
+            return False
         
         if self.mover_para_alvo():
             grid_x, grid_y = self.alvo_atual
             resultado = False
             
             # Validar se o alvo ainda é válido antes de executar
-            alvo_valido = False
-            if self.tipo == 'cultivador':
-                alvo_valido = ((grid_x, grid_y) in farm_system.terra_adubada and 
-                              (grid_x, grid_y) not in farm_system.fazenda)
-            elif self.tipo == 'coletador':
-                planta = farm_system.fazenda.get((grid_x, grid_y))
-                alvo_valido = planta is not None and planta['estagio'] == 6 and not planta.get('estragada', False)
-            elif self.tipo == 'adubador':
-                alvo_valido = ((grid_x, grid_y) in water_system.terra_aguada and
-                              (grid_x, grid_y) not in farm_system.terra_adubada and
-                              (grid_x, grid_y) not in farm_system.fazenda and
-                              (grid_x, grid_y) not in water_system.buracos_com_agua)
+            tarefa = TAREFA_POR_TIPO.get(self.tipo)
+            alvo_valido = tarefa is not None and self.alvo_atual in farm_system.mundo.tarefas[tarefa]
             
             # Se o alvo não é mais válido, desalocar e procurar novo na próxima iteração
             if not alvo_valido:
@@ -283,6 +267,8 @@ class Worker:
                     resultado = farm_system.plantar_semente(grid_x, grid_y, 
                                                            player.semente_selecionada, 
                                                            player.sementes, water_system)
+                    if resultado:
+                        player.marcar_alterado()
             elif self.tipo == 'coletador':
                 colheu, valor = farm_system.colher_planta(grid_x, grid_y)
                 if colheu:
@@ -302,7 +288,8 @@ class Worker:
 
 
 class WorkerSystem:
-    def __init__(self):
+    def __init__(self, relogio=None, modo_agendamento=MODO_AGENDAMENTO_TRABALHADORES):
+        self.relogio = relogio if relogio is not None else SimClock()
         self.trabalhadores = []
         self.tipos_trabalhador = {
             'cultivador': {'nome': 'Cultivador', 'preco': 300, 'descricao': 'Planta sementes', 'custo_manutencao': 1},
@@ -310,29 +297,103 @@ class WorkerSystem:
             'adubador': {'nome': 'Adubador', 'preco': 300, 'descricao': 'Aduba terra', 'custo_manutencao': 1}
         }
         self.worker_consciousness = WorkerConsciousness()
+        self.modo_agendamento = modo_agendamento if modo_agendamento in MODOS_AGENDAMENTO else 'individual'
+    
+    def definir_modo_agendamento(self, modo):
+        """Troca entre agendamento 'individual' e 'lote'"""
+        if modo not in MODOS_AGENDAMENTO:
+            return False
+        self.modo_agendamento = modo
+        return True
     
     def contratar_trabalhador(self, tipo, player, posicao_spawn):
         preco = self.tipos_trabalhador[tipo]['preco']
         
         if player.gastar_dinheiro(preco):
-            worker = Worker(tipo, posicao_spawn)
+            worker = Worker(tipo, posicao_spawn, self.relogio)
             worker.worker_id = self.worker_consciousness.gerar_id_worker()
             self.trabalhadores.append(worker)
             return True
         return False
     
     def atualizar_trabalhadores(self, farm_system, water_system, player):
+        self.worker_consciousness.expirar_reservas(self.relogio.agora())
+        
+        em_lote = self.modo_agendamento == 'lote'
+        if em_lote:
+            self.atribuir_tarefas_em_lote(farm_system)
+        
         for worker in self.trabalhadores:
             if worker.ativo:
-                worker.executar_trabalho(farm_system, water_system, player, self.worker_consciousness)
+                worker.executar_trabalho(farm_system, water_system, player, self.worker_consciousness,
+                                         buscar_alvo=not em_lote)
             else:
                 # Tentar reativar trabalhador se houver dinheiro
-                tempo_atual = time.time()
+                tempo_atual = self.relogio.agora()
                 if tempo_atual - worker.ultimo_pagamento >= worker.intervalo_pagamento:
                     if player.dinheiro >= worker.custo_manutencao:
                         worker.ativo = True
                         print(f"Trabalhador {worker.tipo} voltou ao trabalho!")
     
+    def atribuir_tarefas_em_lote(self, farm_system):
+        """
+        Casa todos os trabalhadores ociosos de cada tipo com tarefas livres numa única passada.
+        Cada worker contribui com as tarefas livres mais próximas; os pares são atendidos
+        do mais curto para o mais longo (casamento guloso por distância), evitando que
+        vários workers disputem o mesmo tile e fiquem reservando e liberando tarefas.
+        """
+        tempo_atual = self.relogio.agora()
+        consciencia = self.worker_consciousness
+        
+        ociosos_por_tipo = {}
+        for worker in self.trabalhadores:
+            if worker.esta_ocioso(tempo_atual):
+                ociosos_por_tipo.setdefault(worker.tipo, []).append(worker)
+        
+        for tipo, ociosos in ociosos_por_tipo.items():
+            tarefa = TAREFA_POR_TIPO.get(tipo)
+            if tarefa is None:
+                continue
+            indice = farm_system.mundo.tarefas[tarefa]
+            if not indice:
+                continue
+            
+            livre = lambda pos: not consciencia.tarefa_esta_alocada(pos)
+            k = min(len(ociosos), LIMITE_CANDIDATOS_LOTE)
+            
+            pares = []
+            for i, worker in enumerate(ociosos):
+                grid_x = int(worker.x // TAMANHO_CELULA)
+                grid_y = int(worker.y // TAMANHO_CELULA)
+                for distancia, posicao in indice.k_proximos(grid_x, grid_y, k, livre):
+                    pares.append((distancia, i, posicao))
+            pares.sort()
+            
+            atendidos = set()
+            for distancia, i, posicao in pares:
+                if i in atendidos:
+                    continue
+                worker = ociosos[i]
+                if consciencia.alocar_tarefa(posicao, worker.worker_id, tempo_atual):
+                    worker.alvo_atual = posicao
+                    atendidos.add(i)
+                    if len(atendidos) == len(ociosos):
+                        break
+            
+            # Quem perdeu todos os seus candidatos para outros busca individualmente
+            if len(atendidos) < len(ociosos):
+                for i, worker in enumerate(ociosos):
+                    if i in atendidos:
+                        continue
+                    grid_x = int(worker.x // TAMANHO_CELULA)
+                    grid_y = int(worker.y // TAMANHO_CELULA)
+                    alvos = indice.k_proximos(grid_x, grid_y, 1, livre)
+                    if not alvos:
+                        break
+                    posicao = alvos[0][1]
+                    consciencia.alocar_tarefa(posicao, worker.worker_id, tempo_atual)
+                    worker.alvo_atual = posicao
+    
     def remover_trabalhador(self, index):
         """Remove um trabalhador e limpa suas tarefas alocadas"""
         if 0 <= index < len(self.trabalhadores):
@@ -358,9 +419,9 @@ class WorkerSystem:
     def carregar_dados(self, dados_trabalhadores):
         self.trabalhadores = []
         self.worker_consciousness = WorkerConsciousness()
-        tempo_atual = time.time()
+        tempo_atual = self.relogio.agora()
         for dado in dados_trabalhadores:
-            worker = Worker(dado['tipo'], (dado['x'], dado['y']))
+            worker = Worker(dado['tipo'], (dado['x'], dado['y']), self.relogio)
             worker.ativo = dado.get('ativo', True)
             worker.worker_id = self.worker_consciousness.gerar_id_worker()
             # Restaurar tempo de último pagamento
@@ -368,10 +429,12 @@ class WorkerSystem:
             self.trabalhadores.append(worker)
     
     def obter_dados_save(self):
+        # O relógio recomeça a cada sessão, então o save guarda quanto tempo passou desde o pagamento
+        tempo_atual = self.relogio.agora()
         return [{
             'tipo': w.tipo,
             'x': w.x,
             'y': w.y,
             'ativo': w.ativo,
-            'ultimo_pagamento': w.ultimo_pagamento
+            'tempo_desde_pagamento': tempo_atual - w.ultimo_pagamento
         } for w in self.trabalhadores]
@@ -0,0 +1,424 @@
+import heapq
+from config import TAMANHO_CHUNK
+
+
+def chave_chunk(grid_x, grid_y):
+    """Converte coordenadas de grid para a coordenada do chunk que as contém"""
+    return grid_x // TAMANHO_CHUNK, grid_y // TAMANHO_CHUNK
+
+
+class ChunkLayer:
+    """
+    Camada de tiles dividida em chunks de TAMANHO_CHUNK x TAMANHO_CHUNK.
+    Funciona como um dict {(grid_x, grid_y): valor}, mas permite consultar
+    apenas os chunks que cruzam uma região em vez de percorrer o mapa todo.
+    ao_alterar, se definido, é chamado com a posição após cada mudança.
+    """
+    def __init__(self, ao_alterar=None):
+        self.chunks = {}  # {(chunk_x, chunk_y): {(grid_x, grid_y): valor}}
+        self._tamanho = 0
+        self.ao_alterar = ao_alterar
+    
+    def __len__(self):
+        return self._tamanho
+    
+    def __bool__(self):
+        return self._tamanho > 0
+    
+    def __contains__(self, posicao):
+        chunk = self.chunks.get((posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK))
+        return chunk is not None and posicao in chunk
+    
+    def __iter__(self):
+        for chunk in list(self.chunks.values()):
+            yield from list(chunk)
+    
+    def __getitem__(self, posicao):
+        chunk = self.chunks.get((posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK))
+        if chunk is None:
+            raise KeyError(posicao)
+        return chunk[posicao]
+    
+    def __setitem__(self, posicao, valor):
+        chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+        chunk = self.chunks.get(chave)
+        if chunk is None:
+            chunk = self.chunks[chave] = {}
+        if posicao not in chunk:
+            self._tamanho += 1
+        chunk[posicao] = valor
+        if self.ao_alterar is not None:
+            self.ao_alterar(posicao)
+    
+    def __delitem__(self, posicao):
+        chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+        chunk = self.chunks.get(chave)
+        if chunk is None or posicao not in chunk:
+            raise KeyError(posicao)
+        del chunk[posicao]
+        self._tamanho -= 1
+        if not chunk:
+            del self.chunks[chave]
+        if self.ao_alterar is not None:
+            self.ao_alterar(posicao)
+    
+    def get(self, posicao, padrao=None):
+        chunk = self.chunks.get((posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK))
+        if chunk is None:
+            return padrao
+        return chunk.get(posicao, padrao)
+    
+    def pop(self, posicao, *padrao):
+        if posicao in self:
+            valor = self[posicao]
+            del self[posicao]
+            return valor
+        if padrao:
+            return padrao[0]
+        raise KeyError(posicao)
+    
+    def items(self):
+        for chunk in list(self.chunks.values()):
+            yield from list(chunk.items())
+    
+    def values(self):
+        for chunk in list(self.chunks.values()):
+            yield from list(chunk.values())
+    
+    def keys(self):
+        return iter(self)
+    
+    def update(self, dados):
+        for posicao, valor in dados.items():
+            self[posicao] = valor
+    
+    def substituir(self, dados):
+        """
+        Troca todo o conteúdo da camada de uma vez, sem chamar ao_alterar por tile
+        (usado ao carregar: quem chama atualiza o que depende da camada).
+        """
+        chunks = self.chunks
+        chunks.clear()
+        for posicao, valor in dados.items():
+            chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+            chunk = chunks.get(chave)
+            if chunk is None:
+                chunk = chunks[chave] = {}
+            chunk[posicao] = valor
+        self._tamanho = sum(len(chunk) for chunk in chunks.values())
+    
+    def clear(self):
+        posicoes = list(self) if self.ao_alterar is not None else ()
+        self.chunks.clear()
+        self._tamanho = 0
+        for posicao in posicoes:
+            self.ao_alterar(posicao)
+    
+    def _chunks_no_retangulo(self, min_x, min_y, max_x, max_y):
+        """Retorna os chunks existentes que cruzam o retângulo (inclusivo, em coordenadas de grid)"""
+        min_cx, min_cy = chave_chunk(min_x, min_y)
+        max_cx, max_cy = chave_chunk(max_x, max_y)
+        
+        # Retângulo maior que o mundo ocupado: mais barato filtrar os chunks existentes
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.chunks):
+            return [chunk for (cx, cy), chunk in self.chunks.items()
+                    if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy]
+        
+        chunks = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    chunks.append(chunk)
+        return chunks
+    
+    def consultar_retangulo(self, min_x, min_y, max_x, max_y):
+        """Gera as posições dentro do retângulo [min_x, max_x] x [min_y, max_y]"""
+        for chunk in self._chunks_no_retangulo(min_x, min_y, max_x, max_y):
+            for posicao in chunk:
+                if min_x <= posicao[0] <= max_x and min_y <= posicao[1] <= max_y:
+                    yield posicao
+    
+    def itens_no_retangulo(self, min_x, min_y, max_x, max_y):
+        """Gera os pares (posicao, valor) dentro do retângulo"""
+        for chunk in self._chunks_no_retangulo(min_x, min_y, max_x, max_y):
+            for posicao, valor in chunk.items():
+                if min_x <= posicao[0] <= max_x and min_y <= posicao[1] <= max_y:
+                    yield posicao, valor
+    
+    def consultar_vizinhanca(self, grid_x, grid_y, raio):
+        """Gera as posições no quadrado de lado 2*raio+1 centrado em (grid_x, grid_y)"""
+        return self.consultar_retangulo(grid_x - raio, grid_y - raio, grid_x + raio, grid_y + raio)
+    
+    def proximos(self, grid_x, grid_y):
+        """
+        Gera (distancia, posicao) em ordem crescente de distância manhattan.
+        Os chunks funcionam como grade de baldes: são visitados em anéis ao redor
+        do ponto e só são abertos quando podem conter a próxima posição mais próxima.
+        """
+        cx0, cy0 = grid_x // TAMANHO_CHUNK, grid_y // TAMANHO_CHUNK
+        heap_chunks = []   # (distancia mínima até o chunk, chave)
+        heap_posicoes = []  # (distancia, posicao)
+        anel = 0
+        pendentes = len(self.chunks)  # chunks ainda não enfileirados
+        infinito = float('inf')
+        
+        while True:
+            # Nenhum chunk de um anel ainda não visitado pode estar mais perto que isso
+            limite = max(0, (anel - 1) * TAMANHO_CHUNK + 1) if pendentes > 0 else infinito
+            melhor_posicao = heap_posicoes[0][0] if heap_posicoes else infinito
+            melhor_chunk = heap_chunks[0][0] if heap_chunks else infinito
+            
+            if limite < melhor_posicao and limite < melhor_chunk:
+                lado = 2 * anel + 1
+                if lado * lado > len(self.chunks):
+                    # Já foram consultadas mais chaves que chunks existentes: enfileira de uma vez os restantes
+                    heap_chunks.extend(
+                        (self._distancia_chunk(chave, grid_x, grid_y), chave)
+                        for chave in self.chunks
+                        if max(abs(chave[0] - cx0), abs(chave[1] - cy0)) >= anel
+                    )
+                    heapq.heapify(heap_chunks)
+                    pendentes = 0
+                else:
+                    for chave in self._chaves_anel(cx0, cy0, anel):
+                        if chave in self.chunks:
+                            heapq.heappush(heap_chunks, (self._distancia_chunk(chave, grid_x, grid_y), chave))
+                            pendentes -= 1
+                anel += 1
+            elif heap_chunks and melhor_chunk <= melhor_posicao:
+                _, chave = heapq.heappop(heap_chunks)
+                for posicao in list(self.chunks.get(chave, ())):
+                    distancia = abs(posicao[0] - grid_x) + abs(posicao[1] - grid_y)
+                    heapq.heappush(heap_posicoes, (distancia, posicao))
+            elif heap_posicoes:
+                yield heapq.heappop(heap_posicoes)
+            else:
+                return
+    
+    def k_proximos(self, grid_x, grid_y, k, aceitar=None):
+        """Retorna até k pares (distancia, posicao) mais próximos que passam no filtro aceitar"""
+        resultado = []
+        if k <= 0:
+            return resultado
+        for distancia, posicao in self.proximos(grid_x, grid_y):
+            if aceitar is None or aceitar(posicao):
+                resultado.append((distancia, posicao))
+                if len(resultado) >= k:
+                    break
+        return resultado
+    
+    @staticmethod
+    def _distancia_chunk(chave, grid_x, grid_y):
+        """Menor distância manhattan entre o ponto e qualquer tile do chunk"""
+        inicio_x = chave[0] * TAMANHO_CHUNK
+        inicio_y = chave[1] * TAMANHO_CHUNK
+        dx = max(inicio_x - grid_x, 0, grid_x - (inicio_x + TAMANHO_CHUNK - 1))
+        dy = max(inicio_y - grid_y, 0, grid_y - (inicio_y + TAMANHO_CHUNK - 1))
+        return dx + dy
+    
+    @staticmethod
+    def _chaves_anel(cx0, cy0, anel):
+        """Chaves dos chunks a distância de Chebyshev exatamente igual a anel"""
+        if anel == 0:
+            yield cx0, cy0
+            return
+        for cx in range(cx0 - anel, cx0 + anel + 1):
+            yield cx, cy0 - anel
+            yield cx, cy0 + anel
+        for cy in range(cy0 - anel + 1, cy0 + anel):
+            yield cx0 - anel, cy
+            yield cx0 + anel, cy
+
+
+class ChunkSet(ChunkLayer):
+    """Versão de ChunkLayer que funciona como um set de posições"""
+    
+    def __setitem__(self, posicao, valor):
+        self.add(posicao)
+    
+    def add(self, posicao):
+        chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+        chunk = self.chunks.get(chave)
+        if chunk is None:
+            chunk = self.chunks[chave] = set()
+        if posicao not in chunk:
+            chunk.add(posicao)
+            self._tamanho += 1
+            if self.ao_alterar is not None:
+                self.ao_alterar(posicao)
+    
+    def discard(self, posicao):
+        chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+        chunk = self.chunks.get(chave)
+        if chunk is not None and posicao in chunk:
+            chunk.discard(posicao)
+            self._tamanho -= 1
+            if not chunk:
+                del self.chunks[chave]
+            if self.ao_alterar is not None:
+                self.ao_alterar(posicao)
+    
+    def __delitem__(self, posicao):
+        if posicao not in self:
+            raise KeyError(posicao)
+        self.discard(posicao)
+    
+    def __getitem__(self, posicao):
+        if posicao not in self:
+            raise KeyError(posicao)
+        return True
+    
+    def get(self, posicao, padrao=None):
+        return True if posicao in self else padrao
+    
+    def items(self):
+        for posicao in self:
+            yield posicao, True
+    
+    def values(self):
+        for _ in self:
+            yield True
+    
+    def update(self, posicoes):
+        for posicao in posicoes:
+            self.add(posicao)
+    
+    def substituir(self, posicoes):
+        """Troca todo o conteúdo do set de uma vez, sem chamar ao_alterar por tile"""
+        chunks = self.chunks
+        chunks.clear()
+        for posicao in posicoes:
+            chave = (posicao[0] // TAMANHO_CHUNK, posicao[1] // TAMANHO_CHUNK)
+            chunk = chunks.get(chave)
+            if chunk is None:
+                chunk = chunks[chave] = set()
+            chunk.add(posicao)
+        self._tamanho = sum(len(chunk) for chunk in chunks.values())
+    
+    def definir_chunk(self, chave, posicoes):
+        """Troca as posições de um chunk inteiro (posicoes deve estar dentro dele)"""
+        anterior = self.chunks.pop(chave, None)
+        if anterior:
+            self._tamanho -= len(anterior)
+        if posicoes:
+            self.chunks[chave] = posicoes
+            self._tamanho += len(posicoes)
+    
+    def itens_no_retangulo(self, min_x, min_y, max_x, max_y):
+        for posicao in self.consultar_retangulo(min_x, min_y, max_x, max_y):
+            yield posicao, True
+
+
+class WorldStore:
+    """
+    Armazenamento espacial compartilhado de todas as camadas de tiles do mundo.
+    FarmSystem e WaterSystem usam as mesmas instâncias, de modo que renderização
+    e buscas dos trabalhadores possam consultar apenas os chunks próximos.
+    
+    Também mantém os índices de trabalho disponível (tarefas), atualizados a
+    cada mudança nas camadas em vez de recalculados a cada busca, e versões
+    por chunk para a renderização saber o que mudou: versoes_terreno (só as
+    camadas do terreno) e versoes_chunk (qualquer mudança, incluindo plantas).
+    
+    Com o diário de saves ativo, alteracoes guarda as posições mudadas desde o
+    último save, para que ele grave só esses tiles.
+    """
+    def __init__(self):
+        self.versoes_terreno = {}  # {(chunk_x, chunk_y): versão}
+        self.versoes_chunk = {}    # {(chunk_x, chunk_y): versão}
+        self.alteracoes = None     # set de posições, ou None se ninguém acompanha as mudanças
+        
+        self.fazenda = ChunkLayer(self.atualizar_tarefas)
+        self.terra_adubada = ChunkSet(self._alterar_terreno)
+        self.terra_aguada = ChunkSet(self._alterar_terra_aguada)
+        self.buracos_com_agua = ChunkSet(self._alterar_terreno)
+        
+        self.tarefas = {
+            'plantar': ChunkSet(),  # adubada e sem planta
+            'colher': ChunkSet(),   # planta madura e não estragada
+            'adubar': ChunkSet()    # aguada, sem adubo, sem planta e sem buraco
+        }
+    
+    def _alterar_terreno(self, posicao, registrar=True):
+        chave = chave_chunk(posicao[0], posicao[1])
+        self.versoes_terreno[chave] = self.versoes_terreno.get(chave, 0) + 1
+        self.atualizar_tarefas(posicao, registrar)
+    
+    def _alterar_terra_aguada(self, posicao):
+        # A terra aguada é refeita a partir dos buracos ao carregar, não precisa ir para o diário
+        self._alterar_terreno(posicao, registrar=False)
+    
+    def recarregar_camada(self, camada, dados):
+        """
+        Troca todo o conteúdo de uma camada de uma vez (ao carregar). Em vez do ao_alterar
+        de cada tile, as versões e as tarefas de cada chunk afetado são refeitas uma única vez.
+        dados é um dict {posição: valor} para a fazenda e um iterável de posições para os sets.
+        """
+        anteriores = list(camada) if self.alteracoes is not None else ()
+        afetados = set(camada.chunks)
+        camada.substituir(dados)
+        afetados.update(camada.chunks)
+        
+        terreno = camada is not self.fazenda
+        for chave in afetados:
+            if terreno:
+                self.versoes_terreno[chave] = self.versoes_terreno.get(chave, 0) + 1
+            self.versoes_chunk[chave] = self.versoes_chunk.get(chave, 0) + 1
+            self._reconstruir_tarefas_chunk(chave)
+        
+        # A terra aguada é derivada dos buracos e não vai para o diário
+        if self.alteracoes is not None and camada is not self.terra_aguada:
+            self.alteracoes.update(anteriores)
+            self.alteracoes.update(camada)
+    
+    def _reconstruir_tarefas_chunk(self, chave):
+        """Refaz os índices de tarefas de um chunk inteiro (mesmas regras de atualizar_tarefas)"""
+        vazio = frozenset()
+        plantas = self.fazenda.chunks.get(chave, {})
+        adubada = self.terra_adubada.chunks.get(chave, vazio)
+        
+        self.tarefas['plantar'].definir_chunk(chave, adubada.difference(plantas))
+        self.tarefas['colher'].definir_chunk(chave, {posicao for posicao, planta in plantas.items()
+                                                     if planta.estagio == 6 and not planta.estragada})
+        self.tarefas['adubar'].definir_chunk(chave, self.terra_aguada.chunks.get(chave, vazio).difference(
+            adubada, plantas, self.buracos_com_agua.chunks.get(chave, vazio)))
+    
+    def versao_terreno(self, chave):
+        """Versão do terreno de um chunk; muda sempre que um tile dele é alterado"""
+        return self.versoes_terreno.get(chave, 0)
+    
+    def versao_chunk(self, chave):
+        """Versão de um chunk considerando todas as camadas e os estágios das plantas"""
+        return self.versoes_chunk.get(chave, 0)
+    
+    def atualizar_tarefas(self, posicao, registrar=True):
+        """
+        Reavalia em quais índices de tarefas a posição deve estar.
+        Chamado a cada mudança em qualquer camada, então também marca o chunk como alterado.
+        registrar=False deixa a mudança fora de alteracoes (ex: estágio, que é derivado do tempo).
+        """
+        chave = chave_chunk(posicao[0], posicao[1])
+        self.versoes_chunk[chave] = self.versoes_chunk.get(chave, 0) + 1
+        if registrar and self.alteracoes is not None:
+            self.alteracoes.add(posicao)
+        
+        planta = self.fazenda.get(posicao)
+        adubada = posicao in self.terra_adubada
+        
+        if adubada and planta is None:
+            self.tarefas['plantar'].add(posicao)
+        else:
+            self.tarefas['plantar'].discard(posicao)
+        
+        if planta is not None and planta.estagio == 6 and not planta.estragada:
+            self.tarefas['colher'].add(posicao)
+        else:
+            self.tarefas['colher'].discard(posicao)
+        
+        if (not adubada and planta is None and
+            posicao in self.terra_aguada and
+            posicao not in self.buracos_com_agua):
+            self.tarefas['adubar'].add(posicao)
+        else:
+            self.tarefas['adubar'].discard(posicao)